@@ -0,0 +1,220 @@
+# benchmarks/bench_core.py
+# ⏱️ Core engine micro-benchmarks with JSON output for regression tracking
+#
+# What "size" means for each benchmark:
+#   codex.search          entries in the codex
+#   memory.search         stored queries
+#   judgment.evaluate     characters per claim (verdict memo disabled)
+#   translator.translate  symbolic -> math mappings
+#   fusion.fuse           symbols fused in one call
+#   reasoning.reason      codex entries and stored queries, each
+#
+# Examples:
+#   python benchmarks/bench_core.py --output before.json
+#   python benchmarks/bench_core.py --output after.json --compare before.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flat_layout  # maps sully_engine.* onto a flat checkout
+
+flat_layout.install()
+
+from sully_engine.codex import SullyCodex
+from sully_engine.memory import SullySearchMemory
+from sully_engine.reasoning import SymbolicReasoningNode
+from sully_engine.kernel_modules.judgment import JudgmentProtocol
+from sully_engine.kernel_modules.math_translator import SymbolicMathTranslator
+from sully_engine.kernel_modules.fusion import SymbolFusionEngine
+
+WORDS = ["infinity", "change", "paradox", "entropy", "symbol", "dream",
+         "recursion", "origin", "memory", "growth", "truth", "mirror",
+         "math", "ethics", "plato", "∞", "→", "and not", "equilibrium"]
+
+
+def phrase(rng, words=4):
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + f" #{rng.randrange(10**7)}"
+
+
+def measure(fn, args, repeats):
+    """
+    Times `fn(arg)` once per arg (cycling) after one warm-up call.
+
+    Returns:
+        dict: Per-call timing summary in seconds.
+    """
+    fn(args[0])
+    samples = []
+    for i in range(repeats):
+        arg = args[i % len(args)]
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    return {
+        "repeats": repeats,
+        "mean_s": statistics.fmean(samples),
+        "median_s": statistics.median(samples),
+        "min_s": samples[0],
+        "p95_s": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+# ----------------------------------------------------------------
+# Benchmarks: each yields (size, needle_label, fn, args) as it grows
+# ----------------------------------------------------------------
+
+def bench_codex(sizes, rng):
+    codex = SullyCodex()
+    for size in sizes:
+        while len(codex.entries) < size:
+            codex.record(f"topic {len(codex.entries)} {phrase(rng, 2)}", {"reframed": phrase(rng)})
+        yield size, "hit", codex.search, ["entropy mirror", "paradox", "#1234"]
+        yield size, "miss", codex.search, ["xyzzy", "qwerty plugh"]
+
+
+def bench_memory(sizes, rng):
+    memory = SullySearchMemory()
+    for size in sizes:
+        while len(memory.storage) < size:
+            memory.store_query(phrase(rng), {"reframed": "..."})
+        yield size, "hit", lambda keyword: memory.search(keyword, limit=10), ["entropy mirror", "paradox"]
+        yield size, "miss", memory.search, ["xyzzy", "qwerty plugh"]
+
+
+def bench_judgment(sizes, rng):
+    judgment = JudgmentProtocol(verdict_cache_size=0)
+    for size in sizes:
+        claims = []
+        for _ in range(8):
+            words = []
+            while sum(len(w) + 1 for w in words) < size:
+                words.append(rng.choice(WORDS))
+            claims.append(" ".join(words)[:size])
+        yield size, "claim", judgment.evaluate, claims
+
+
+def bench_translator(sizes, rng):
+    translator = SymbolicMathTranslator()
+    for size in sizes:
+        while len(translator.math_mappings) < size:
+            translator.add_mapping(phrase(rng, 2), f"f_{len(translator.math_mappings)}(x)")
+        texts = [phrase(rng, 12) + " growth area under curve" for _ in range(8)]
+        yield size, "sentence", translator.translate, texts
+
+
+def bench_fusion(sizes, rng):
+    fusion = SymbolFusionEngine()
+    for size in sizes:
+        symbols = [rng.choice(WORDS) for _ in range(size)]
+        yield size, "symbols", lambda s: fusion.fuse(*s), [symbols]
+
+
+def bench_reasoning(sizes, rng):
+    codex, memory = SullyCodex(), SullySearchMemory()
+    node = SymbolicReasoningNode(codex=codex, translator=SymbolicMathTranslator(), memory=memory)
+    for size in sizes:
+        while len(codex.entries) < size:
+            codex.record(f"topic {len(codex.entries)} {phrase(rng, 2)}", {"reframed": phrase(rng)})
+        while len(memory.storage) < size:
+            memory.store_query(phrase(rng), {"reframed": "..."})
+        yield size, "message", node.reason, ["growth of the mirror", "entropy paradox", "xyzzy"]
+
+
+BENCHMARKS = {
+    "codex.search": bench_codex,
+    "memory.search": bench_memory,
+    "judgment.evaluate": bench_judgment,
+    "translator.translate": bench_translator,
+    "fusion.fuse": bench_fusion,
+    "reasoning.reason": bench_reasoning,
+}
+
+
+# ----------------------------------------------------------------
+# Runner and comparison
+# ----------------------------------------------------------------
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(names, sizes, repeats, seed=7):
+    results = []
+    for name in names:
+        rng = random.Random(seed)
+        for size, case, fn, args in BENCHMARKS[name](sorted(sizes), rng):
+            timing = measure(fn, args, repeats)
+            results.append({"benchmark": name, "case": case, "size": size, **timing})
+            print(f"{name:<22} {case:<9} {size:>10,}  median {timing['median_s'] * 1e6:12.1f} µs  "
+                  f"p95 {timing['p95_s'] * 1e6:12.1f} µs", flush=True)
+
+    return {
+        "created": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """
+    Prints median ratios against a baseline report.
+
+    Returns:
+        list: Result keys that slowed down by more than `threshold`.
+    """
+    before = {(r["benchmark"], r["case"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nvs baseline {baseline.get('git_revision') or baseline.get('created')}:")
+    for r in report["results"]:
+        key = (r["benchmark"], r["case"], r["size"])
+        if key not in before:
+            continue
+        ratio = r["median_s"] / before[key]["median_s"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"  {key[0]:<22} {key[1]:<9} {key[2]:>10,}  x{ratio:6.2f}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sully core engine micro-benchmarks")
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5],
+                        help="data sizes to run (up to 10**7; large sizes need several GB of RAM)")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON report to compare medians against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="median slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    report = run(args.benchmarks, args.sizes, args.repeats, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
@@ -0,0 +1,76 @@
+# benchmarks/bench_deskew.py
+# ⏱️ Skew estimation: speed and angle error on synthetic rotated pages
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flat_layout  # maps sully_engine.* onto a flat checkout
+
+flat_layout.install()
+
+from sully_engine.kernel_modules.autoflatten import estimate_skew, min_area_rect_skew, rotate_image
+
+ESTIMATORS = {
+    "min_area_rect": min_area_rect_skew,
+    "fast": estimate_skew,
+}
+
+
+def synthetic_page(rng, dpi):
+    """
+    Renders an A4 page of pseudo-text lines at the given DPI.
+    """
+    w, h = int(8.27 * dpi), int(11.69 * dpi)
+    page = np.full((h, w), 255, dtype=np.uint8)
+    line_height = int(0.22 * dpi)
+    margin = int(0.8 * dpi)
+    font_scale = dpi / 150
+
+    for y in range(margin, h - margin, line_height):
+        words = [
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+            for _ in range(rng.randint(6, 12))
+        ]
+        cv2.putText(page, " ".join(words), (margin, y), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, 0, max(1, int(font_scale * 2)), cv2.LINE_AA)
+    return page
+
+
+def run(dpi, pages, max_skew, seed=11):
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(pages):
+        skew = rng.uniform(-max_skew, max_skew)
+        # Rotating by `skew` means the correct deskew angle is `-skew`.
+        samples.append((-skew, rotate_image(synthetic_page(rng, dpi), skew)))
+
+    print(f"{pages} pages at {dpi} DPI ({samples[0][1].shape[1]}x{samples[0][1].shape[0]}), "
+          f"skew within ±{max_skew}°")
+    for name, estimator in ESTIMATORS.items():
+        errors, seconds = [], []
+        for expected, page in samples:
+            start = time.perf_counter()
+            angle = estimator(page)
+            seconds.append(time.perf_counter() - start)
+            errors.append(abs(angle - expected))
+
+        print(f"  {name:<14} median {statistics.median(seconds) * 1e3:8.1f} ms   "
+              f"mean |error| {statistics.mean(errors):6.3f}°   max |error| {max(errors):6.3f}°")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deskew estimator benchmark")
+    parser.add_argument("--dpi", type=int, nargs="+", default=[300, 600])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--max-skew", type=float, default=8.0)
+    args = parser.parse_args()
+    for dpi in args.dpi:
+        run(dpi, args.pages, args.max_skew)
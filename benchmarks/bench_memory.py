@@ -0,0 +1,61 @@
+# benchmarks/bench_memory.py
+# ⏱️ SullySearchMemory.search latency as stored queries grow
+
+import argparse
+import random
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flat_layout  # maps sully_engine.* onto a flat checkout
+
+flat_layout.install()
+
+from sully_engine.memory import SullySearchMemory
+
+WORDS = ["infinity", "change", "paradox", "entropy", "symbol", "dream",
+         "recursion", "origin", "memory", "growth", "truth", "mirror"]
+
+
+def synthetic_query(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(4)) + f" #{rng.randrange(10**7)}"
+
+
+def linear_search(memory, keyword):
+    """
+    The pre-index full scan, kept here as the baseline.
+    """
+    needle = keyword.lower()
+    return {i: e for i, e in enumerate(memory.storage) if needle in e["query"].lower()}
+
+
+def run(sizes, repeats=20, seed=7):
+    rng = random.Random(seed)
+    memory = SullySearchMemory()
+    keywords = ["#1234567", "entropy mirror", "xyzzy", "paradox"]
+
+    for size in sizes:
+        while len(memory.storage) < size:
+            memory.store_query(synthetic_query(rng), {"reframed": "..."})
+
+        for keyword in keywords:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                hits = memory.search(keyword, limit=10)
+            indexed = (time.perf_counter() - start) / repeats
+
+            start = time.perf_counter()
+            linear_search(memory, keyword)
+            linear = time.perf_counter() - start
+
+            print(f"{size:>10,}  {keyword!r:<18} hits={len(hits):<3} "
+                  f"indexed={indexed * 1e3:9.3f} ms  linear={linear * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SullySearchMemory search scaling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**5, 10**6])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.repeats)
@@ -0,0 +1,124 @@
+# benchmarks/bench_startup.py
+# ⏱️ Cold-start time and memory of a Sully process, with JSON output
+#
+# Each case runs in fresh interpreters, so nothing is cached between runs.
+# Results use the same report format as bench_core.py:
+#   python benchmarks/bench_startup.py --output startup.json
+#   python benchmarks/bench_startup.py --compare startup.json
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+from bench_core import compare, git_revision
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["numpy", "PIL", "pytesseract", "pdf2image", "PyPDF2", "cv2", "fitz", "pymupdf"]
+
+CASES = {
+    # What a chat-only API worker pays at boot.
+    "sully": "import sully; sully.Sully()",
+    "main": "import main",
+    # The deferred cost, paid by the first ingestion instead.
+    "sully+ingestor": (
+        "import sully; s = sully.Sully(); s.book_ingestor\n"
+        "from sully_engine.kernel_modules.ocr_engine import _tesseract; _tesseract()\n"
+        "import pdf2image"
+    ),
+}
+
+# flat_layout lets `import sully` / `import main` resolve to sully[1].py /
+# main[1].py in a flat checkout; it does nothing in the deployed layout.
+PROBE = """
+import resource, sys, time, json
+import flat_layout; flat_layout.install()
+start = time.perf_counter()
+{code}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def probe(code, cwd):
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY_MODULES)],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        return None, out.stderr.strip().splitlines()[-1]
+    return json.loads(out.stdout.strip().splitlines()[-1]), None
+
+
+def run(names, repeats):
+    results = []
+    with tempfile.TemporaryDirectory() as cwd:  # Sully() creates its stores in the cwd
+        for name in names:
+            samples = []
+            for _ in range(repeats):
+                sample, error = probe(CASES[name], cwd)
+                if error:
+                    print(f"{name:<16} skipped: {error}")
+                    break
+                samples.append(sample)
+            if not samples:
+                continue
+
+            seconds = sorted(s["seconds"] for s in samples)
+            result = {
+                "benchmark": "startup",
+                "case": name,
+                "size": 0,
+                "repeats": len(samples),
+                "mean_s": statistics.fmean(seconds),
+                "median_s": statistics.median(seconds),
+                "min_s": seconds[0],
+                "max_rss_mb": statistics.median(s["max_rss_mb"] for s in samples),
+                "modules": samples[-1]["modules"],
+                "heavy_modules": samples[-1]["heavy"],
+            }
+            results.append(result)
+            print(f"{name:<16} median {result['median_s'] * 1e3:8.1f} ms  rss {result['max_rss_mb']:6.1f} MB  "
+                  f"modules {result['modules']:5}  heavy {', '.join(result['heavy_modules']) or '-'}")
+
+    return {
+        "created": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sully cold-start benchmark")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON report to compare medians against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="median slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    report = run(args.cases, args.repeats)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
@@ -0,0 +1,71 @@
+# sully_engine/kernel_modules/book_manifest.py
+# 📒 Sully's Library Manifest — What has already been ingested from disk
+
+import json
+import os
+
+
+class BookManifest:
+    """
+    Remembers the size, mtime and content hash of every ingested library
+    file so a folder re-sync only processes files that are new or changed.
+    """
+
+    def __init__(self, path="sully_books_manifest.json"):
+        self.path = path
+        self.files = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.files = json.load(f)
+
+    def scan(self, folder_path, extensions):
+        """
+        Walks a folder and returns the files that need (re)checking.
+        Entries for files no longer on disk are dropped.
+
+        Args:
+            folder_path (str): Library root, searched recursively.
+            extensions (tuple): Lowercase extensions to include.
+
+        Returns:
+            list: (path, stat, known_sha256) for new or modified files;
+            known_sha256 is the previously recorded hash, if any.
+        """
+        seen = set()
+        pending = []
+
+        for root, _, filenames in os.walk(folder_path):
+            for filename in sorted(filenames):
+                if not filename.lower().endswith(extensions):
+                    continue
+                path = os.path.join(root, filename)
+                stat = os.stat(path)
+                seen.add(path)
+
+                known = self.files.get(path)
+                if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+                    continue
+                pending.append((path, stat, known and known["sha256"]))
+
+        for path in set(self.files) - seen:
+            del self.files[path]
+        return pending
+
+    def record(self, path, stat, sha256):
+        """
+        Marks a file as ingested at its current size, mtime and hash.
+        """
+        self.files[path] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": sha256,
+        }
+
+    def save(self):
+        """
+        Writes the manifest atomically.
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.files, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -1,15 +1,31 @@
 # sully_engine/codex.py
 # 📚 Sully's Symbolic Codex (Knowledge Book)
 
+import heapq
+import threading
 from datetime import datetime
+from .ngram_index import TrigramIndex
 
 class SullyCodex:
     """
     Stores named symbolic knowledge entries and enables semantic lookup.
+
+    With a storage backend, entries are shared between processes: writes go
+    to the backend and every read first applies what other processes wrote.
     """
 
-    def __init__(self):
+    def __init__(self, backend=None):
         self.entries = {}
+        self._order = {}
+        self._topics = []  # insertion position -> topic
+        self._index = TrigramIndex()  # keyed by insertion position
+        self._lock = threading.RLock()
+
+        self.backend = backend
+        self._epoch = 0
+        self._version = 0
+        with self._lock:
+            self._sync()
 
     def record(self, topic, data):
         """
@@ -19,48 +35,163 @@ class SullyCodex:
             topic (str): The symbolic topic or name.
             data (dict): Associated symbolic data or metadata.
         """
-        self.entries[topic.lower()] = {
+        topic = topic.lower()
+        entry = {
             **data,
             "timestamp": datetime.now().isoformat()
         }
 
-    def search(self, phrase, case_sensitive=False):
+        if self.backend is not None:
+            self.backend.put("codex", topic, entry)
+        with self._lock:
+            if self.backend is None:
+                self._apply(topic, entry)
+            self._sync()
+
+    def restore(self, entries, index_base=None):
+        """
+        Replaces the codex with saved entries (topic -> data), keeping their
+        timestamps and order. With `index_base` (e.g. trigram postings
+        mapped from a snapshot, keyed by position) the entries are taken
+        as they are, e.g. a snapshot-backed RecordMap, and not re-indexed.
+        """
+        with self._lock:
+            self._index.clear()
+            if index_base is not None:
+                self.entries = entries
+                self._topics = list(entries)
+                self._order = {topic: i for i, topic in enumerate(self._topics)}
+                self._index.base = index_base
+                return
+            self.entries = {}
+            self._order = {}
+            self._topics = []
+            for topic, entry in entries.items():
+                self._apply(topic, entry)
+
+    def _apply(self, topic, entry):
+        """
+        Stores an entry locally and re-indexes it. Caller holds the lock.
+        """
+        previous = self.entries.get(topic)
+        if previous is not None:
+            self._index.remove(self._order[topic], self.index_text(topic, previous))
+        else:
+            self._order[topic] = len(self._order)
+            self._topics.append(topic)
+
+        self.entries[topic] = entry
+        self._index.add(self._order[topic], self.index_text(topic, entry))
+
+    def _sync(self):
+        """
+        Applies entries written to the backend since the last sync. Caller
+        holds the lock.
+        """
+        if self.backend is None:
+            return
+        epoch, self._version, rows = self.backend.changes("codex", self._epoch, self._version)
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self.entries = {}
+            self._order = {}
+            self._topics = []
+            self._index.clear()
+        for topic, entry in rows:
+            self._apply(topic, entry)
+
+    def search(self, phrase, case_sensitive=False, limit=None):
         """
         Searches the codex for entries matching a phrase.
 
         Args:
             phrase (str): The search keyword.
             case_sensitive (bool): Match case when scanning.
+            limit (int or None): Keep only the best `limit` matches, ranked
+                exact topic, then topic containing the phrase, then value
+                containing it (older entries first within a rank).
 
         Returns:
             dict: Matching entries (topic -> data).
         """
         results = {}
+        ranks = {}
         phrase_check = phrase if case_sensitive else phrase.lower()
 
-        for topic, data in self.entries.items():
-            topic_check = topic if case_sensitive else topic.lower()
-            values = [str(v) for v in data.values()]
+        # Only entries sharing every trigram of the phrase can match; verify those.
+        with self._lock:
+            self._sync()
+            for position in sorted(self._index.candidates(phrase_check)):
+                topic = self._topics[position]
+                data = self.entries[topic]
+                topic_check = topic if case_sensitive else topic.lower()
+                values = [str(v) for v in data.values()]
 
-            if phrase_check in topic_check or any(phrase_check in v.lower() for v in values):
+                if phrase_check == topic_check:
+                    ranks[topic] = 0
+                elif phrase_check in topic_check:
+                    ranks[topic] = 1
+                elif any(phrase_check in v.lower() for v in values):
+                    ranks[topic] = 2
+                else:
+                    continue
                 results[topic] = data
 
+            if limit is not None and len(results) > limit:
+                best = heapq.nsmallest(limit, results, key=lambda t: (ranks[t], self._order[t]))
+                results = {topic: results[topic] for topic in best}
+
         return results
 
+    def index_text(self, topic, data):
+        """
+        Builds the lowercased text indexed for an entry (topic plus all values).
+        """
+        values = "\x00".join(str(v).lower() for v in data.values())
+        return f"{topic}\x00{values}"
+
     def get(self, topic):
         """
         Gets a codex entry by topic name.
         """
-        return self.entries.get(topic.lower(), {"message": "🔍 No codex entry found."})
+        with self._lock:
+            self._sync()
+            return self.entries.get(topic.lower(), {"message": "🔍 No codex entry found."})
 
     def list_topics(self):
         """
         Returns a list of all topic names currently in the codex.
         """
-        return list(self.entries.keys())
+        with self._lock:
+            self._sync()
+            return list(self.entries.keys())
+
+    def page(self, cursor=0, limit=100):
+        """
+        Returns one page of codex entries in the order topics were first
+        recorded. Re-recording a topic keeps its place, so cursors stay valid.
+
+        Args:
+            cursor (int): Position to start from (0, or a previous next_cursor).
+            limit (int): Max number of entries returned.
+
+        Returns:
+            dict: `items` (topic -> data) and `next_cursor` (None at the end).
+        """
+        with self._lock:
+            self._sync()
+            topics = self._topics[cursor:cursor + limit]
+            end = cursor + len(topics)
+            return {
+                "items": {topic: self.entries[topic] for topic in topics},
+                "next_cursor": end if end < len(self._topics) else None,
+            }
 
     def export(self):
         """
-        Returns all codex entries (for backup, JSON export, or UI rendering).
+        Returns a copy of all codex entries (for backup, JSON export, or UI
+        rendering), taken under the lock so writers can keep recording.
         """
-        return self.entries
\ No newline at end of file
+        with self._lock:
+            self._sync()
+            return dict(self.entries)
\ No newline at end of file
@@ -0,0 +1,390 @@
+# sully_engine/kernel_modules/corpus_store.py
+# 📚 Sully's Corpus Store — Chunked, memory-mapped storage for ingested text
+
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # no cross-process lock (Windows): keep to one writer process
+    fcntl = None
+
+# chunks.idx record: doc_id, segment, byte offset, byte length
+CHUNK_RECORD = struct.Struct("<IIQI")
+
+
+def split_chunks(text, chunk_chars):
+    """
+    Splits text into pieces of about `chunk_chars` characters, cutting at
+    a newline or space in the second half of each piece when there is one.
+    Joining the pieces gives back the original text.
+    """
+    start, n = 0, len(text)
+    while start < n:
+        end = min(start + chunk_chars, n)
+        if end < n:
+            lo = start + chunk_chars // 2
+            cut = text.rfind("\n", lo, end)
+            if cut < 0:
+                cut = text.rfind(" ", lo, end)
+            if cut >= 0:
+                end = cut + 1
+        yield text[start:end]
+        start = end
+
+
+class CorpusStore:
+    """
+    On-disk store for ingested document text.
+
+    Documents are split into chunks of UTF-8 text appended to segment
+    files; a fixed-size record per chunk (chunks.idx) locates it, and
+    documents.jsonl maps each source path to its run of chunks. Chunks are
+    read through memory-mapped segments, so resident memory is bounded by
+    what is being read, not by the size of the corpus.
+
+    Several processes (e.g. API workers) may share one corpus directory:
+    writers take an exclusive file lock and first read what others have
+    committed, so ids and segment offsets never collide. Documents added by
+    other processes become visible to a reader on refresh().
+
+    Re-ingesting a path appends a new version; the old chunks stay on disk
+    (counted in `garbage_bytes`) but are no longer reachable by path.
+    """
+
+    def __init__(self, root="sully_corpus", chunk_chars=16384, segment_bytes=1 << 30):
+        """
+        Args:
+            root (str): Directory holding segments and indexes.
+            chunk_chars (int): Target characters per chunk.
+            segment_bytes (int): Size at which a new segment file is started.
+        """
+        self.root = root
+        self.chunk_chars = chunk_chars
+        self.segment_bytes = segment_bytes
+        os.makedirs(root, exist_ok=True)
+
+        self.documents = {}  # path -> {"doc_id", "first_chunk", "chunks", "chars", "bytes"}
+        self.doc_paths = []  # doc_id -> path
+        self.garbage_bytes = 0
+        self._lock = threading.RLock()
+        self._depth = 0  # nesting of _exclusive() in the thread holding it
+        self._maps = {}  # segment -> mmap
+
+        self._index_path = os.path.join(root, "chunks.idx")
+        self._docs_path = os.path.join(root, "documents.jsonl")
+        self._chunks = bytearray()  # committed chunk records
+        self._committed = 0  # chunks referenced by a document line
+        self._docs_read = 0  # bytes of documents.jsonl consumed
+        self._segment_ends = {}  # segment -> end of its last committed chunk
+
+        self._lock_file = open(os.path.join(root, "lock"), "a+b")
+        self._idx_file = open(self._index_path, "ab")
+        self._docs_file = open(self._docs_path, "a", encoding="utf-8")
+        self._segment = 0
+        self._segment_file = None
+        with self._exclusive():
+            self._refresh()
+            self._repair()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.root, f"segment-{segment:06d}.dat")
+
+    def _segment_numbers(self):
+        return [
+            int(name[8:14]) for name in os.listdir(self.root)
+            if name.startswith("segment-") and name.endswith(".dat")
+        ]
+
+    @contextmanager
+    def _exclusive(self):
+        """
+        Holds the thread lock and, across processes, the corpus file lock.
+        Re-entrant: only the outermost call takes and releases the file lock.
+        """
+        with self._lock:
+            if self._depth == 0 and fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def locked(self):
+        """
+        Returns a context manager holding the corpus write lock, across
+        processes; for writers of files kept alongside the corpus.
+        """
+        return self._exclusive()
+
+    # ----------------------------------------------------------------
+    # Recovery
+    # ----------------------------------------------------------------
+
+    def refresh(self):
+        """
+        Picks up documents committed since the last read, including those
+        written by other processes.
+
+        Returns:
+            int: Documents added to this view.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        """
+        Reads complete document lines past the last one read, then the chunk
+        records they commit. A line still being written is left for later.
+        Caller holds the lock.
+        """
+        count = 0
+        with open(self._docs_path, "rb") as f:
+            f.seek(self._docs_read)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    doc = json.loads(line)
+                except ValueError:
+                    break
+                self._docs_read += len(line)
+                self._register(doc)
+                self._committed = max(self._committed, doc["first_chunk"] + doc["chunks"])
+                count += 1
+
+        known = self.chunk_count()
+        if self._committed > known:
+            with open(self._index_path, "rb") as f:
+                f.seek(known * CHUNK_RECORD.size)
+                records = f.read((self._committed - known) * CHUNK_RECORD.size)
+            self._chunks += records
+            for _, segment, offset, length in CHUNK_RECORD.iter_unpack(records):
+                self._segment_ends[segment] = max(self._segment_ends.get(segment, 0), offset + length)
+        return count
+
+    def _repair(self):
+        """
+        Cuts back whatever no document line commits: a torn last document
+        line, trailing chunk records, and segment bytes past the last
+        committed chunk (all left by a writer that died mid-add). Caller
+        holds the exclusive lock, so no other writer is mid-add.
+        """
+        if os.path.getsize(self._docs_path) > self._docs_read:
+            self._docs_file.flush()
+            os.truncate(self._docs_path, self._docs_read)
+        if os.path.getsize(self._index_path) > len(self._chunks):
+            self._idx_file.flush()
+            os.truncate(self._index_path, len(self._chunks))
+
+        for segment in self._segment_numbers():
+            end = self._segment_ends.get(segment, 0)
+            if os.path.getsize(self._segment_path(segment)) > end:
+                if self._segment_file is not None and segment == self._segment:
+                    self._segment_file.flush()
+                os.truncate(self._segment_path(segment), end)
+
+        # Continue in the newest segment, wherever other writers left it.
+        latest = max(self._segment_numbers(), default=0)
+        if self._segment_file is None or latest != self._segment:
+            self._open_segment(latest)
+        self._segment_file.seek(0, os.SEEK_END)
+
+    def _open_segment(self, segment):
+        if self._segment_file is not None:
+            self._segment_file.close()
+        self._segment = segment
+        self._segment_file = open(self._segment_path(segment), "ab")
+        self._segment_file.seek(0, os.SEEK_END)
+
+    def _register(self, doc):
+        previous = self.documents.get(doc["path"])
+        if previous is not None:
+            self.garbage_bytes += previous["bytes"]
+        self.documents[doc["path"]] = doc
+        self.doc_paths.append(doc["path"])
+
+    # ----------------------------------------------------------------
+    # Writes
+    # ----------------------------------------------------------------
+
+    def add(self, path, text):
+        """
+        Stores a document's text, superseding any earlier version of the path.
+
+        Returns:
+            int: The new document id.
+        """
+        with self._exclusive():
+            # Catch up with other writers so ids and offsets follow theirs.
+            self._refresh()
+            self._repair()
+
+            doc_id = len(self.doc_paths)
+            first_chunk = self.chunk_count()
+            records = bytearray()
+            total = 0
+
+            for piece in split_chunks(text, self.chunk_chars):
+                data = piece.encode("utf-8")
+                size = self._segment_file.tell()
+                if size and size + len(data) > self.segment_bytes:
+                    self._segment_file.flush()
+                    self._open_segment(self._segment + 1)
+                offset = self._segment_file.tell()
+                self._segment_file.write(data)
+                records += CHUNK_RECORD.pack(doc_id, self._segment, offset, len(data))
+                total += len(data)
+            self._segment_file.flush()
+
+            self._idx_file.write(records)
+            self._idx_file.flush()
+
+            doc = {
+                "path": path,
+                "doc_id": doc_id,
+                "first_chunk": first_chunk,
+                "chunks": len(records) // CHUNK_RECORD.size,
+                "chars": len(text),
+                "bytes": total,
+            }
+            # The document line commits the chunks written above.
+            self._docs_file.write(json.dumps(doc) + "\n")
+            self._docs_file.flush()
+            self._refresh()
+            return doc_id
+
+    def import_items(self, items, if_empty=False):
+        """
+        Adds (path, text) pairs, e.g. from a legacy ingestion store.
+
+        Args:
+            items (iterable): (path, text) pairs, consumed lazily.
+            if_empty (bool): Import only into an empty corpus; checked under
+                the file lock, so of several processes migrating at once
+                only the first imports.
+
+        Returns:
+            int: Number of documents imported.
+        """
+        count = 0
+        with self._exclusive():
+            self._refresh()
+            if if_empty and self.documents:
+                return 0
+            for path, text in items:
+                self.add(path, text)
+                count += 1
+        return count
+
+    # ----------------------------------------------------------------
+    # Reads
+    # ----------------------------------------------------------------
+
+    def chunk_count(self):
+        """
+        Returns the number of chunks written, including superseded ones.
+        """
+        return len(self._chunks) // CHUNK_RECORD.size
+
+    def chunk_info(self, chunk_id):
+        """
+        Returns (doc_id, segment, offset, length) for a chunk.
+        """
+        return CHUNK_RECORD.unpack_from(self._chunks, chunk_id * CHUNK_RECORD.size)
+
+    def chunk(self, chunk_id):
+        """
+        Returns a zero-copy memoryview of a chunk's UTF-8 bytes.
+        """
+        _, segment, offset, length = self.chunk_info(chunk_id)
+        return memoryview(self._map(segment, offset + length))[offset:offset + length]
+
+    def chunk_text(self, chunk_id):
+        """
+        Returns a chunk decoded as text.
+        """
+        return str(self.chunk(chunk_id), "utf-8")
+
+    def _map(self, segment, needed):
+        """
+        Returns a read-only mapping of a segment covering `needed` bytes,
+        remapping once the segment has grown past the current mapping.
+        Views into superseded mappings stay valid until released.
+        """
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < needed:
+            with self._lock:
+                mapped = self._maps.get(segment)
+                if mapped is None or len(mapped) < needed:
+                    with open(self._segment_path(segment), "rb") as f:
+                        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._maps[segment] = mapped
+        return mapped
+
+    def chunk_ids(self, path):
+        """
+        Returns the chunk ids of a path's current version, in order.
+        """
+        doc = self.documents.get(path)
+        if doc is None:
+            return range(0)
+        return range(doc["first_chunk"], doc["first_chunk"] + doc["chunks"])
+
+    def iter_chunks(self):
+        """
+        Yields (chunk_id, path) for every chunk of every current document.
+        """
+        for path in self.paths():
+            for chunk_id in self.chunk_ids(path):
+                yield chunk_id, path
+
+    def get(self, path, default=None):
+        """
+        Returns a document's full text, or the default if absent.
+        """
+        if path not in self.documents:
+            return default
+        return "".join(self.chunk_text(i) for i in self.chunk_ids(path))
+
+    def __contains__(self, path):
+        return path in self.documents
+
+    def __len__(self):
+        return len(self.documents)
+
+    def paths(self):
+        """
+        Returns the list of stored document paths.
+        """
+        with self._lock:
+            return list(self.documents.keys())
+
+    def stats(self):
+        """
+        Returns document, chunk and byte counts.
+        """
+        with self._lock:
+            live = sum(doc["bytes"] for doc in self.documents.values())
+            return {
+                "documents": len(self.documents),
+                "chunks": self.chunk_count(),
+                "live_bytes": live,
+                "garbage_bytes": self.garbage_bytes,
+                "segments": self._segment + 1,
+            }
+
+    def close(self):
+        with self._lock:
+            self._idx_file.close()
+            self._docs_file.close()
+            self._segment_file.close()
+            self._lock_file.close()
+            self._maps.clear()
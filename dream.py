@@ -3,27 +3,55 @@
 
 import random
 
+SEGMENT_TEMPLATES = [
+    "'{motif}' echoes in the void.",
+    "{Motif} dissolves into paradox.",
+    "Perception bends backward into {motif}.",
+    "A pattern of {motif} forms — and fades.",
+    "Meaning loops through {motif}, then vanishes.",
+    "{Motif} folds into itself, one layer deeper.",
+    "Beneath {motif}, another dream is already dreaming.",
+    "{Motif} mirrors what was never seen.",
+]
+
+MOTIFS = [
+    "the void", "paradox", "memory", "a pattern", "meaning", "the mirror",
+    "infinity", "origin", "entropy", "silence", "the spiral", "time",
+]
+
+
 class DreamCore:
     """
     Generates symbolic dream-like reflections from a seed phrase.
     Supports recursion, surreal metaphors, and vision symbols.
+
+    Every dream draws from its own random generator seeded by the request,
+    so the same seed (and variant) always dreams the same way.
     """
 
     def __init__(self, style="recursive"):
         self.style = style
         self.symbol_pool = ["🌌", "🌀", "♾️", "🔮", "☯️", "⚛️", "💫"]
 
-    def generate(self, seed):
+    def _rng(self, seed, *params):
+        """
+        Returns a generator seeded from the request; str seeds hash the
+        same way in every process.
+        """
+        return random.Random("\x00".join(map(str, (self.style, seed, *params))))
+
+    def generate(self, seed, variant=0):
         """
         Generates a symbolic dream from a given seed phrase.
 
         Args:
             seed (str): Input seed for the dream sequence.
+            variant (int): Selects another dream for the same seed.
 
         Returns:
             dict: Dream reflection, symbolic output, and vision.
         """
-        symbol = random.choice(self.symbol_pool)
+        symbol = self._rng(seed, variant).choice(self.symbol_pool)
         vision = (
             f"In the dreamscape of '{seed}', Sully sees recursion folding into infinity."
             if self.style == "recursive"
@@ -36,27 +64,65 @@ class DreamCore:
             "symbol": symbol
         }
 
-    def dreamscape(self, seed):
+    def iter_dreamscape(self, seed, depth=3, budget=40, branching=2, variant=0):
+        """
+        Lazily unfolds a recursive dreamscape from the seed, depth first:
+        each segment dreams `branching` deeper segments about a motif drawn
+        from it, until `depth` levels or `budget` segments are reached.
+
+        Args:
+            seed (str): The seed concept to imagine from.
+            depth (int): Levels of recursion below the seed segment.
+            budget (int): Most segments produced in total.
+            branching (int): Deeper segments dreamt from each segment.
+            variant (int): Selects another dreamscape for the same seed.
+
+        Yields:
+            dict: Segment index, depth, path (e.g. "0.1.0"), text and symbol.
+        """
+        rng = self._rng(seed, depth, budget, branching, variant)
+        motifs = [seed] + [word for word in seed.split() if len(word) > 3]
+        remaining = [budget]
+
+        def unfold(motif, level, path):
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+            template = rng.choice(SEGMENT_TEMPLATES)
+            yield {
+                "index": budget - remaining[0] - 1,
+                "depth": level,
+                "path": path,
+                "text": template.format(motif=motif, Motif=motif[:1].upper() + motif[1:]),
+                "symbol": rng.choice(self.symbol_pool),
+            }
+            if level >= depth:
+                return
+            for branch in range(branching):
+                child = rng.choice(MOTIFS) if rng.random() < 0.7 else rng.choice(motifs)
+                yield from unfold(child, level + 1, f"{path}.{branch}")
+
+        yield from unfold(seed, 0, "0")
+
+    def dreamscape(self, seed, depth=2, budget=12, branching=2, variant=0):
         """
         Returns an extended symbolic sequence from the seed (for poetic mode).
 
         Args:
             seed (str): The seed concept to imagine from.
+            depth, budget, branching, variant: As for iter_dreamscape().
 
         Returns:
             dict: List of poetic symbolic phrases forming a dreamscape.
         """
         segments = [
-            f"'{seed}' echoes in the void.",
-            "Symbols dissolve into paradox.",
-            "Perception bends backward into memory.",
-            "A pattern forms — and fades.",
-            "Meaning loops, then vanishes.",
+            segment["text"]
+            for segment in self.iter_dreamscape(seed, depth, budget, branching, variant)
         ]
         return {
             "seed": seed,
             "dreamscape": segments,
-            "symbol": random.choice(self.symbol_pool)
+            "symbol": self._rng(seed, variant).choice(self.symbol_pool)
         }
 
 
@@ -65,4 +131,6 @@ class DreamCore:
 # ========================
 # dreamer = DreamCore()
 # print(dreamer.generate("entropy"))
-# print(dreamer.dreamscape("time"))
\ No newline at end of file
+# print(dreamer.dreamscape("time"))
+# for segment in dreamer.iter_dreamscape("time", depth=4, budget=100):
+#     print("  " * segment["depth"] + segment["text"])
@@ -0,0 +1,143 @@
+# sully_engine/kernel_modules/extraction_cache.py
+# 🗃️ Sully's Extraction Cache — Content-addressed text for files and pages
+
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import Future
+
+
+class ExtractionCache:
+    """
+    Caches extracted text on disk keyed by content hash, so re-uploads of
+    the same bytes (under any filename) and pages shared between documents
+    skip extraction and OCR.
+
+    Concurrent requests for the same key are merged: the first caller
+    computes, later callers wait on the same Future.
+    """
+
+    def __init__(self, root="sully_cache"):
+        self.root = root
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------
+    # Keys
+    # ----------------------------------------------------------------
+
+    @staticmethod
+    def file_digest(file_path, chunk_size=1024 * 1024):
+        """
+        Returns the SHA-256 of a file's bytes, read in chunks.
+        """
+        h = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                h.update(chunk)
+        return h.hexdigest()
+
+    @staticmethod
+    def page_digest(image):
+        """
+        Returns the SHA-256 of a rendered page image (mode, size and pixels).
+        """
+        h = hashlib.sha256(f"{image.mode}:{image.size}".encode())
+        h.update(image.tobytes())
+        return h.hexdigest()
+
+    # ----------------------------------------------------------------
+    # Storage
+    # ----------------------------------------------------------------
+
+    def _path(self, kind, digest):
+        return os.path.join(self.root, kind, digest[:2], f"{digest}.txt")
+
+    def get(self, kind, digest):
+        """
+        Returns cached text, or None on a miss.
+        """
+        try:
+            with open(self._path(kind, digest), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, kind, digest, text):
+        """
+        Stores text atomically under (kind, digest).
+        """
+        path = self._path(kind, digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A unique temp file per call: worker processes share the directory.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with open(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    # ----------------------------------------------------------------
+    # Single-flight
+    # ----------------------------------------------------------------
+
+    def claim(self, kind, digest):
+        """
+        Looks up a key, joining any in-flight computation for it.
+
+        Returns:
+            tuple: (future, leader). If `leader` is True the caller must
+            compute the text and call settle(); otherwise the future
+            resolves to the cached or in-flight text.
+        """
+        key = (kind, digest)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+
+            future = Future()
+            cached = self.get(kind, digest)
+            if cached is not None:
+                future.set_result(cached)
+                return future, False
+
+            self._inflight[key] = future
+            return future, True
+
+    def settle(self, kind, digest, future, text=None, error=None, store=True):
+        """
+        Completes a claimed key, storing the text unless it failed. The
+        future is always resolved, so waiters never hang; if storing fails
+        they still get the text and the error is raised afterwards.
+        """
+        try:
+            if error is None and store:
+                self.put(kind, digest, text)
+        finally:
+            with self._lock:
+                self._inflight.pop((kind, digest), None)
+            if error is None:
+                future.set_result(text)
+            else:
+                future.set_exception(error)
+
+    def compute(self, kind, digest, fn, cacheable=lambda text: True):
+        """
+        Returns cached text for a key, or computes it once via `fn()`
+        while concurrent callers for the same key wait for that result.
+        """
+        future, leader = self.claim(kind, digest)
+        if not leader:
+            return future.result()
+
+        try:
+            text = fn()
+        except BaseException as e:
+            self.settle(kind, digest, future, error=e)
+            raise
+        self.settle(kind, digest, future, text, store=cacheable(text))
+        return text
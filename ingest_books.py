@@ -2,56 +2,199 @@
 # 📖 Sully's Book Ingestion Gateway
 
 import os
-from PyPDF2 import PdfReader
 from ..kernel_modules.ocr_engine import SullyOCREngine
+from ..kernel_modules.extraction_cache import ExtractionCache
+from ..kernel_modules.ocr_engine import INGEST_STAGES, INGEST_PAGES
+from ..metrics import REGISTRY
+
+INGEST_FILE_SECONDS = REGISTRY.histogram(
+    "sully_ingest_file_seconds", "Wall time to ingest one file, by extension.", ("format",)
+)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt", ".md", ".docx")
+
+
+class IngestionError(Exception):
+    """
+    Raised when a document cannot be read or its text extracted.
+    """
+
+
+def ingest_file(file_path, ocr_enabled=False, cache_root=None, known_sha256=None):
+    """
+    Extracts one file in a fresh ingestor. Top-level so library syncs can
+    run it in worker processes; OCR runs in-process to avoid nested pools.
+
+    Args:
+        file_path (str): Document to read.
+        ocr_enabled (bool): OCR PDFs instead of reading their text layer.
+        cache_root (str or None): ExtractionCache directory to share.
+        known_sha256 (str or None): Hash recorded at the last sync; if the
+            content still matches, extraction is skipped.
+
+    Returns:
+        tuple: (sha256, text) — text is None when the content is unchanged.
+
+    Raises:
+        IngestionError: If the file cannot be read or extracted.
+    """
+    try:
+        sha256 = ExtractionCache.file_digest(file_path)
+    except OSError as e:
+        raise IngestionError(f"Cannot read file: {e}") from e
+    if sha256 == known_sha256:
+        return sha256, None
+
+    cache = ExtractionCache(cache_root) if cache_root else None
+    ingestor = BookIngestor(ocr_enabled=ocr_enabled, cache=cache, ocr_workers=1)
+    return sha256, ingestor.ingest(file_path)
+
 
 class BookIngestor:
     """
     Ingests various text-based document formats and extracts their content
-    for symbolic learning. Supports optional OCR for scanned PDFs.
+    for symbolic learning. Supports optional OCR for scanned PDFs: pages
+    with an embedded text layer are read directly, and only image-only
+    pages go through OCR.
     """
 
-    def __init__(self, ocr_enabled=False):
-        self.ocr = SullyOCREngine() if ocr_enabled else None
+    def __init__(self, ocr_enabled=False, cache=None, ocr_workers=None, min_text_chars=20):
+        self.ocr = SullyOCREngine(workers=ocr_workers, cache=cache) if ocr_enabled else None
+        self.cache = cache
+        self.min_text_chars = min_text_chars
 
-    def ingest(self, file_path):
+    def ingest(self, file_path, progress=None):
         """
         Ingests a file based on its extension.
 
+        Args:
+            file_path (str): Document to read.
+            progress (callable or None): Called as `progress(done, total)`
+                as pages (or whole non-paged files) are extracted.
+
         Returns:
-            str: Extracted text, or error message.
+            str: Extracted text (empty if the file has none).
+
+        Raises:
+            IngestionError: If the file cannot be read or extracted.
         """
+        watch = REGISTRY.stopwatch(INGEST_FILE_SECONDS)
+        text = self._ingest_cached(file_path, progress)
+        watch.lap(os.path.splitext(file_path)[1].lower())
+        return text
+
+    def _ingest_cached(self, file_path, progress=None):
+        """
+        Returns the file's text from the extraction cache, extracting it
+        on a miss.
+        """
+        if self.cache is None:
+            return self._ingest(file_path, progress)
+
         try:
             ext = os.path.splitext(file_path)[1].lower()
+            mode = "hybrid" if self.ocr else "text"
+            digest = f"{mode}{ext}-{self.cache.file_digest(file_path)}"
+        except OSError as e:
+            raise IngestionError(f"Cannot read file: {e}") from e
+
+        computed = []
+
+        def extract():
+            computed.append(True)
+            return self._ingest(file_path, progress)
 
+        # Failures raise, so only extracted text is ever cached.
+        text = self.cache.compute("file", digest, extract)
+        if not computed:
+            self._report(text, progress)
+        return text
+
+    def _ingest(self, file_path, progress=None):
+        """
+        Extracts a file's text without consulting the cache.
+        """
+        ext = os.path.splitext(file_path)[1].lower()
+        try:
             if ext == ".pdf":
-                if self.ocr:
-                    return self.ocr.extract_text_from_pdf(file_path)
-                return self._extract_text_pdf(file_path)
+                return self._extract_text_pdf(file_path, progress=progress)
 
             elif ext in [".txt", ".md"]:
-                return self._extract_text_text(file_path)
+                return self._report(self._extract_text_text(file_path), progress)
 
             elif ext == ".docx":
-                return self._extract_text_docx(file_path)
-
-            return "[Unsupported file type]"
+                return self._report(self._extract_text_docx(file_path), progress)
 
+        except IngestionError:
+            raise
         except Exception as e:
-            return f"[Ingestion Error] {e}"
+            raise IngestionError(f"Ingestion failed: {e}") from e
 
-    def _extract_text_pdf(self, pdf_path):
+        raise IngestionError(f"Unsupported file type: {ext or os.path.basename(file_path)}")
+
+    def _report(self, text, progress):
+        """
+        Reports a single-unit file as fully processed.
+        """
+        if progress:
+            progress(1, 1)
+        return text
+
+    def _extract_text_pdf(self, pdf_path, progress=None):
         """
-        Extracts text from standard (non-scanned) PDFs using PyPDF2.
+        Extracts text per page from the PDF's text layer, OCRing (when
+        enabled) only the pages whose layer has no usable text.
         """
+        watch = REGISTRY.stopwatch(INGEST_STAGES)
         try:
-            text = []
-            reader = PdfReader(pdf_path)
-            for page in reader.pages:
-                text.append(page.extract_text() or "")
-            return "\n".join(text).strip()
+            texts = self._text_layer(pdf_path)
         except Exception as e:
-            return f"[PDF Parsing Error] {e}"
+            if not self.ocr:
+                raise IngestionError(f"PDF parsing failed: {e}") from e
+            try:
+                return self.ocr.ocr_pdf(pdf_path, progress=progress).text
+            except Exception as ocr_error:
+                raise IngestionError(f"OCR failed: {ocr_error}") from ocr_error
+
+        total = len(texts)
+        scanned = [i + 1 for i, t in enumerate(texts) if len(t.strip()) < self.min_text_chars]
+        done = total - len(scanned) if self.ocr else total
+        watch.lap("text_layer")
+        if REGISTRY.enabled:
+            INGEST_PAGES.inc("text_layer", amount=done)
+        if progress:
+            progress(done, total)
+
+        if self.ocr and scanned:
+            try:
+                for page in self.ocr.iter_ocr_pages(pdf_path, pages=scanned):
+                    texts[page["page"] - 1] = page["text"]
+                    done += 1
+                    if progress:
+                        progress(done, total)
+            except Exception as e:
+                raise IngestionError(f"OCR failed: {e}") from e
+            watch.lap("ocr")
+
+        return "\n".join(texts).strip()
+
+    def _text_layer(self, pdf_path):
+        """
+        Returns the embedded text of every page, using PyMuPDF when it is
+        installed (much faster) and PyPDF2 otherwise.
+        """
+        try:
+            import pymupdf
+        except ImportError:
+            try:
+                import fitz as pymupdf  # PyMuPDF < 1.24
+            except ImportError:
+                from PyPDF2 import PdfReader
+                reader = PdfReader(pdf_path)
+                return [page.extract_text() or "" for page in reader.pages]
+
+        with pymupdf.open(pdf_path) as doc:
+            return [page.get_text() for page in doc]
 
     def _extract_text_text(self, txt_path):
         """
@@ -60,8 +203,8 @@ class BookIngestor:
         try:
             with open(txt_path, "r", encoding="utf-8") as f:
                 return f.read().strip()
-        except Exception as e:
-            return f"[Text File Error] {e}"
+        except (OSError, UnicodeDecodeError) as e:
+            raise IngestionError(f"Text file error: {e}") from e
 
     def _extract_text_docx(self, docx_path):
         """
@@ -69,12 +212,13 @@ class BookIngestor:
         """
         try:
             import docx
+        except ImportError:
+            raise IngestionError("Missing `python-docx`. Install it with `pip install python-docx`") from None
+        try:
             doc = docx.Document(docx_path)
             return "\n".join(p.text for p in doc.paragraphs).strip()
-        except ImportError:
-            return "[Missing `python-docx`. Install it with `pip install python-docx`]"
         except Exception as e:
-            return f"[DOCX Error] {e}"
+            raise IngestionError(f"DOCX error: {e}") from e
 
     def summarize_file(self, file_path):
         """
@@ -0,0 +1,136 @@
+# sully_engine/kernel_modules/ingest_jobs.py
+# 📬 Sully's Ingestion Queue — Background jobs for slow book ingests
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class IngestJobQueue:
+    """
+    Runs ingestion jobs on a small pool of background threads.
+
+    The pending queue is bounded so a burst of uploads is rejected early
+    rather than piling up on disk. Finished jobs are kept (up to a limit)
+    so clients can poll status and fetch results after completion.
+    """
+
+    def __init__(self, handler, workers=1, max_pending=16, max_finished=256):
+        """
+        Args:
+            handler (callable): `handler(file_path, progress)` performing the
+                ingest; `progress(done, total)` is called after each page.
+            workers (int): Number of jobs processed concurrently.
+            max_pending (int): Queued jobs allowed before submit() refuses.
+            max_finished (int): Completed jobs retained for status lookups.
+        """
+        self.handler = handler
+        self.max_finished = max_finished
+        self.jobs = OrderedDict()
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True, name=f"sully-ingest-{i}")
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def new_job_id(self):
+        """
+        Returns a fresh job id (also usable to namespace upload paths).
+        """
+        return uuid.uuid4().hex
+
+    def submit(self, file_path, job_id=None, filename=None):
+        """
+        Queues a file for ingestion.
+
+        Returns:
+            dict: Initial job status.
+
+        Raises:
+            queue.Full: If the pending queue is at capacity.
+        """
+        job_id = job_id or self.new_job_id()
+        job = {
+            "job_id": job_id,
+            "filename": filename or file_path,
+            "path": file_path,
+            "status": "queued",
+            "pages_done": 0,
+            "pages_total": None,
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+            "result": None,
+            "error": None,
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+        try:
+            self._pending.put_nowait(job_id)
+        except queue.Full:
+            with self._lock:
+                del self.jobs[job_id]
+            raise
+        return self.status(job_id)
+
+    def status(self, job_id):
+        """
+        Returns a snapshot of a job's state (without the result), or None.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {k: v for k, v in job.items() if k not in ("result", "path")}
+        snapshot["queue_depth"] = self.queue_depth()
+        return snapshot
+
+    def queue_depth(self):
+        """
+        Returns the number of jobs waiting for a worker.
+        """
+        return self._pending.qsize()
+
+    def result(self, job_id):
+        """
+        Returns the job's result, or None if unknown or unfinished.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return job and job["result"]
+
+    def _run(self):
+        while True:
+            job_id = self._pending.get()
+            with self._lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                job["status"] = "running"
+                job["started"] = time.time()
+
+            def progress(done, total, job=job):
+                with self._lock:
+                    job["pages_done"] = done
+                    job["pages_total"] = total
+
+            try:
+                outcome = {"status": "done", "result": self.handler(job["path"], progress)}
+            except Exception as e:
+                outcome = {"status": "failed", "error": str(e)}
+
+            with self._lock:
+                job.update(outcome, finished=time.time())
+                self.jobs.move_to_end(job_id)
+                self._evict_finished()
+
+    def _evict_finished(self):
+        finished = [j for j, job in self.jobs.items() if job["finished"]]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
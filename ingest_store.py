@@ -0,0 +1,337 @@
+# sully_engine/kernel_modules/ingest_store.py
+# 🗄️ Sully's Ingestion Log — Append-only storage for ingested text
+
+import json
+import os
+import threading
+
+
+class IngestStore:
+    """
+    Log-structured store for ingested documents (path -> extracted text).
+
+    Each write appends one JSON line to the log and one entry to a small
+    sidecar offset index, so ingesting a library costs I/O proportional to
+    the new content only. Superseded records are reclaimed by compaction,
+    which can run in a background thread while writes continue.
+
+    Each compaction starts a new log generation, recorded in a header line
+    of both the log and the sidecar, so a sidecar left over from another
+    generation (e.g. by a crash mid-swap) is ignored and the log rescanned.
+    """
+
+    def __init__(self, log_path="sully_ingested.log", compact_ratio=0.5, auto_compact=True):
+        self.log_path = log_path
+        self.index_path = log_path + ".idx"
+        self.compact_ratio = compact_ratio
+        self.auto_compact = auto_compact
+
+        self.offsets = {}  # path -> (offset, length) of the live record
+        self.live_bytes = 0
+        self.end = 0
+        self.generation = 0  # bumped by every compaction
+
+        self._lock = threading.RLock()
+        self._compacting = None
+        self._load()
+        self._log = open(self.log_path, "ab")
+        self._idx = open(self.index_path, "a", encoding="utf-8")
+
+    # ----------------------------------------------------------------
+    # Writes
+    # ----------------------------------------------------------------
+
+    def put(self, path, content):
+        """
+        Appends a document to the log, superseding any earlier version.
+
+        Args:
+            path (str): Source path the text was ingested from.
+            content (str): Extracted text.
+        """
+        self._append({"path": path, "content": content})
+
+    def delete(self, path):
+        """
+        Appends a tombstone so the path no longer resolves.
+        """
+        if path in self.offsets:
+            self._append({"path": path, "deleted": True})
+
+    def _append(self, record):
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        path = record["path"]
+
+        with self._lock:
+            offset = self.end
+            self._log.write(line)
+            self._log.flush()
+            self.end += len(line)
+
+            self._drop(path)
+            if record.get("deleted"):
+                self._idx.write(json.dumps([path, offset, len(line), 1]) + "\n")
+            else:
+                self.offsets[path] = (offset, len(line))
+                self.live_bytes += len(line)
+                self._idx.write(json.dumps([path, offset, len(line)]) + "\n")
+            self._idx.flush()
+
+        if self.auto_compact and self.garbage_ratio() > self.compact_ratio:
+            self.compact(background=True)
+
+    def _drop(self, path):
+        previous = self.offsets.pop(path, None)
+        if previous:
+            self.live_bytes -= previous[1]
+
+    # ----------------------------------------------------------------
+    # Reads
+    # ----------------------------------------------------------------
+
+    def get(self, path, default=None):
+        """
+        Returns the stored text for a path, or the default if absent.
+        """
+        with self._lock:
+            location = self.offsets.get(path)
+            if location is None:
+                return default
+            record = self._read(self.log_path, *location)
+        return record["content"]
+
+    def _read(self, log_path, offset, length):
+        with open(log_path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def __contains__(self, path):
+        return path in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def paths(self):
+        """
+        Returns the list of stored document paths.
+        """
+        return list(self.offsets.keys())
+
+    def items(self):
+        """
+        Yields (path, content) pairs one record at a time.
+        """
+        for path in self.paths():
+            content = self.get(path)
+            if content is not None:
+                yield path, content
+
+    def garbage_ratio(self):
+        """
+        Fraction of the log occupied by superseded or deleted records.
+        """
+        if not self.end:
+            return 0.0
+        return 1 - self.live_bytes / self.end
+
+    # ----------------------------------------------------------------
+    # Recovery
+    # ----------------------------------------------------------------
+
+    def _load(self):
+        """
+        Rebuilds the offset index from the sidecar file, then scans any log
+        tail the sidecar does not cover (e.g. after a crash).
+        """
+        self.offsets, self.live_bytes, self.end = {}, 0, 0
+        log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        self.generation = self._log_generation()
+
+        for path, offset, length, *deleted in self._index_entries():
+            if offset + length > log_size:
+                break
+            self._drop(path)
+            if not deleted:
+                self.offsets[path] = (offset, length)
+                self.live_bytes += length
+            self.end = offset + length
+
+        if self.end < log_size:
+            self._scan_tail(log_size)
+        self._rewrite_index()
+
+    def _log_generation(self):
+        """
+        Returns the generation in the log's header line (0 for a log never
+        compacted, which has none).
+        """
+        if not os.path.exists(self.log_path):
+            return 0
+        with open(self.log_path, "rb") as f:
+            first = f.readline()
+        try:
+            header = json.loads(first)
+        except ValueError:
+            return 0
+        if isinstance(header, dict) and "path" not in header:
+            return header.get("generation", 0)
+        return 0
+
+    def _index_entries(self):
+        """
+        Yields the sidecar's [path, offset, length, (deleted)] entries if it
+        was written for the current log generation; otherwise its offsets
+        point into another log and nothing is yielded.
+        """
+        if not os.path.exists(self.index_path):
+            return
+        generation = 0
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    return
+                if isinstance(entry, dict):
+                    generation = entry.get("generation", 0)
+                    continue
+                if generation != self.generation:
+                    return
+                yield entry
+
+    def _scan_tail(self, log_size):
+        with open(self.log_path, "rb") as f:
+            f.seek(self.end)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write; truncated below
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if "path" in record:  # not the generation header
+                    self._drop(record["path"])
+                    if not record.get("deleted"):
+                        self.offsets[record["path"]] = (self.end, len(line))
+                        self.live_bytes += len(line)
+                self.end += len(line)
+
+        if self.end < log_size:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(self.end)
+
+    def _rewrite_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"generation": self.generation}) + "\n")
+            for path, (offset, length) in self.offsets.items():
+                f.write(json.dumps([path, offset, length]) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    # ----------------------------------------------------------------
+    # Compaction
+    # ----------------------------------------------------------------
+
+    def compact(self, background=False):
+        """
+        Rewrites the log keeping only live records.
+
+        Args:
+            background (bool): Run in a daemon thread and return immediately.
+
+        Returns:
+            threading.Thread or None: The compaction thread when backgrounded.
+        """
+        if not background:
+            self._compact()
+            return None
+
+        with self._lock:
+            if self._compacting and self._compacting.is_alive():
+                return self._compacting
+            self._compacting = threading.Thread(target=self._compact, daemon=True)
+            self._compacting.start()
+            return self._compacting
+
+    def _compact(self):
+        with self._lock:
+            snapshot = sorted(self.offsets.items(), key=lambda item: item[1][0])
+            snapshot_end = self.end
+
+        # Copy the live records without holding the lock so ingestion continues.
+        tmp_log = self.log_path + ".compact"
+        generation = self.generation + 1
+        new_offsets = {}
+        try:
+            with open(self.log_path, "rb") as src, open(tmp_log, "wb") as dst:
+                dst.write((json.dumps({"generation": generation}) + "\n").encode("utf-8"))
+                for path, (offset, length) in snapshot:
+                    src.seek(offset)
+                    new_offsets[path] = (dst.tell(), length)
+                    dst.write(src.read(length))
+
+                # Replay whatever was appended meanwhile, then swap logs.
+                with self._lock:
+                    src.seek(snapshot_end)
+                    for line in src.read(self.end - snapshot_end).splitlines(keepends=True):
+                        if not line.endswith(b"\n"):
+                            break  # torn write; left out of the new log
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            break
+                        new_offsets.pop(record["path"], None)
+                        if not record.get("deleted"):
+                            new_offsets[record["path"]] = (dst.tell(), len(line))
+                        dst.write(line)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                    # Replayed lines include superseded records and tombstones,
+                    # so the new log is longer than its live bytes.
+                    end = dst.tell()
+
+                    # The sidecar still names the old generation, so a crash
+                    # before it is rewritten below only costs a rescan.
+                    self._log.close()
+                    try:
+                        os.replace(tmp_log, self.log_path)
+                    finally:
+                        self._log = open(self.log_path, "ab")
+
+                    self.generation = generation
+                    self.offsets = new_offsets
+                    self.live_bytes = sum(length for _, length in new_offsets.values())
+                    self.end = end
+                    self._idx.close()
+                    self._rewrite_index()
+                    self._idx = open(self.index_path, "a", encoding="utf-8")
+        finally:
+            if os.path.exists(tmp_log):
+                os.remove(tmp_log)
+
+    # ----------------------------------------------------------------
+    # Migration / lifecycle
+    # ----------------------------------------------------------------
+
+    def import_json(self, json_path):
+        """
+        Imports a legacy `{path: content}` JSON dump into the log.
+
+        Returns:
+            int: Number of documents imported.
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        for path, content in legacy.items():
+            self.put(path, content)
+        return len(legacy)
+
+    def close(self):
+        """
+        Waits for compaction and closes the underlying files.
+        """
+        if self._compacting:
+            self._compacting.join()
+        with self._lock:
+            self._log.close()
+            self._idx.close()
@@ -1,13 +1,136 @@
 # sully_engine/kernel_modules/judgment.py
 # ⚖️ Sully's Judgment Protocol — Symbolic truth analysis and consistency scoring
 
+import threading
+import time
+from collections import deque
+from itertools import islice
+from .response_cache import ResponseCache
+from ..metrics import REGISTRY
+
+# Feature phrases per check. Logic and symbol phrases are matched against the
+# claim as written; authority names and domains case-insensitively.
+FEATURE_PHRASES = {
+    "logic": [" and not ", "not ("],
+    "symbolism": ["∂", "∑", "∞", "∫", "↯", "→"],
+    "authorship bias": ["plato", "darwin", "marx", "jesus", "confucius"],
+    "emergence": ["math", "ethics", "logic", "biology", "physics", "metaphysics"],
+}
+CASE_SENSITIVE = {"logic", "symbolism"}
+
+JUDGMENT_STAGES = REGISTRY.histogram(
+    "sully_judgment_stage_seconds", "Time spent scoring and recording claim evaluations.", ("stage",)
+)
+
+
+class JudgmentStats:
+    """
+    Constant-memory running aggregates over every evaluation ever made:
+    verdict counts, a fixed-bin score histogram, and per-check means.
+    """
+
+    def __init__(self, bins=10):
+        self.bins = bins
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.score_sum = 0.0
+        self.score_min = None
+        self.score_max = None
+        self.verdicts = {}
+        self.histogram = [0] * self.bins
+        self.check_sums = {}
+
+    def add(self, evaluation):
+        """
+        Folds one evaluation into the aggregates.
+        """
+        score = evaluation["score"]
+        self.count += 1
+        self.score_sum += score
+        self.score_min = score if self.score_min is None else min(self.score_min, score)
+        self.score_max = score if self.score_max is None else max(self.score_max, score)
+
+        verdict = evaluation["verdict"]
+        self.verdicts[verdict] = self.verdicts.get(verdict, 0) + 1
+        self.histogram[min(int(score * self.bins), self.bins - 1)] += 1
+
+        for check in evaluation["checks"]:
+            name = check["check"]
+            self.check_sums[name] = self.check_sums.get(name, 0.0) + check["score"]
+
+    def to_dict(self):
+        """
+        Returns the raw aggregates, for snapshots.
+        """
+        return {
+            "bins": self.bins,
+            "count": self.count,
+            "score_sum": self.score_sum,
+            "score_min": self.score_min,
+            "score_max": self.score_max,
+            "verdicts": dict(self.verdicts),
+            "histogram": list(self.histogram),
+            "check_sums": dict(self.check_sums),
+        }
+
+    def load(self, state):
+        """
+        Restores aggregates saved by to_dict().
+        """
+        self.bins = state["bins"]
+        self.count = state["count"]
+        self.score_sum = state["score_sum"]
+        self.score_min = state["score_min"]
+        self.score_max = state["score_max"]
+        self.verdicts = dict(state["verdicts"])
+        self.histogram = list(state["histogram"])
+        self.check_sums = dict(state["check_sums"])
+
+    def summary(self):
+        """
+        Returns the aggregates as a JSON-ready dict.
+        """
+        n = self.count or 1
+        width = 1 / self.bins
+        return {
+            "evaluations": self.count,
+            "score_mean": round(self.score_sum / n, 4) if self.count else None,
+            "score_min": self.score_min,
+            "score_max": self.score_max,
+            "verdicts": dict(self.verdicts),
+            "score_histogram": [
+                {"from": round(i * width, 3), "to": round((i + 1) * width, 3), "count": c}
+                for i, c in enumerate(self.histogram)
+            ],
+            "check_means": {name: round(total / n, 4) for name, total in self.check_sums.items()},
+        }
+
+
 class JudgmentProtocol:
     """
     Symbolic reasoning layer to evaluate logical, semantic, and emergent truth.
     """
 
-    def __init__(self):
-        self.truth_vectors = []
+    def __init__(self, history_limit=1000, history_max_age=None, verdict_cache_size=4096):
+        """
+        Args:
+            history_limit (int or None): Most recent evaluations kept in
+                `truth_vectors` (None keeps everything).
+            history_max_age (float or None): Drop evaluations older than
+                this many seconds.
+            verdict_cache_size (int): Distinct claims whose verdicts are
+                memoized (scoring is a pure function of the claim).
+        """
+        self.history_limit = history_limit
+        self.history_max_age = history_max_age
+        self.truth_vectors = deque(maxlen=history_limit)
+        self._recorded_at = deque(maxlen=history_limit)
+        self._recorded = 0  # evaluations ever recorded; numbers history cursors
+        self.stats = JudgmentStats()
+        self.verdicts = ResponseCache(verdict_cache_size)
+        self._lock = threading.Lock()
 
     def evaluate(self, claim):
         """
@@ -19,25 +142,102 @@ class JudgmentProtocol:
         Returns:
             dict: Structured verdict with scores and checks.
         """
+        watch = REGISTRY.stopwatch(JUDGMENT_STAGES)
+        evaluation = self._judge_cached(claim)
+        watch.lap("judge")
+        self._record([evaluation])
+        watch.lap("record")
+        return evaluation
+
+    def evaluate_batch(self, claims):
+        """
+        Evaluates many claims, reusing memoized verdicts for repeated claims.
+
+        Args:
+            claims (list): Claims to evaluate.
+
+        Returns:
+            list: One evaluation per claim, identical to calling evaluate() in turn.
+        """
+        watch = REGISTRY.stopwatch(JUDGMENT_STAGES)
+        evaluations = [self._judge_cached(claim) for claim in claims]
+        watch.lap("batch_judge")
+
+        self._record(evaluations)
+        watch.lap("batch_record")
+        return evaluations
+
+    def _record(self, evaluations):
+        """
+        Adds evaluations to the bounded history and the running aggregates.
+        """
+        with self._lock:
+            now = time.monotonic()
+            for evaluation in evaluations:
+                self.stats.add(evaluation)
+            self.truth_vectors.extend(evaluations)
+            self._recorded_at.extend([now] * len(evaluations))
+            self._recorded += len(evaluations)
+            self._expire(now)
+
+    def _expire(self, now=None):
+        """
+        Evicts evaluations older than `history_max_age`. Caller holds the lock.
+        """
+        if self.history_max_age is None:
+            return
+        cutoff = (now or time.monotonic()) - self.history_max_age
+        while self._recorded_at and self._recorded_at[0] < cutoff:
+            self._recorded_at.popleft()
+            self.truth_vectors.popleft()
+
+    def _judge_cached(self, claim):
+        """
+        Returns a fresh copy of the claim's verdict, scoring it only if it
+        is not memoized.
+        """
+        evaluation = self.verdicts.get_or_compute(claim, lambda: self._judge(claim))
+        return {**evaluation, "checks": [dict(c) for c in evaluation["checks"]]}
+
+    def _judge(self, claim):
+        """
+        Scores a claim from a single feature scan, without recording it.
+        """
+        found = self._scan(claim)
         checks = [
-            self._check_logical_consistency(claim),
-            self._check_symbolic_depth(claim),
-            self._check_author_independence(claim),
+            self._check_logical_consistency(claim, found),
+            self._check_symbolic_depth(claim, found),
+            self._check_author_independence(claim, found),
             self._check_semantic_stability(claim),
-            self._check_emergence_criteria(claim)
+            self._check_emergence_criteria(claim, found)
         ]
         score = sum(c["score"] for c in checks) / len(checks)
         verdict = self._verdict_label(score)
 
-        evaluation = {
+        return {
             "claim": claim,
             "score": round(score, 3),
             "verdict": verdict,
             "checks": checks
         }
 
-        self.truth_vectors.append(evaluation)
-        return evaluation
+    def _scan(self, claim):
+        """
+        Finds every check feature present in the claim, lowercasing it once
+        and testing each phrase table with C-level substring search.
+
+        Returns:
+            set: Names of the checks whose phrases occur in the claim.
+        """
+        lowered = claim.lower()
+        found = set()
+        for feature, phrases in FEATURE_PHRASES.items():
+            text = claim if feature in CASE_SENSITIVE else lowered
+            for phrase in phrases:
+                if phrase in text:
+                    found.add(feature)
+                    break
+        return found
 
     def _verdict_label(self, score):
         """
@@ -51,50 +251,114 @@ class JudgmentProtocol:
 
     def history(self):
         """
-        Returns all previous claim evaluations.
+        Returns the retained claim evaluations, oldest first.
+        """
+        with self._lock:
+            self._expire()
+            return list(self.truth_vectors)
+
+    def history_page(self, cursor=0, limit=100):
+        """
+        Returns one page of the retained history, oldest first. Cursors
+        count every evaluation ever recorded, so they stay valid as old
+        evaluations are evicted; a cursor that points at evicted entries
+        resumes from the oldest one still retained.
+
+        Args:
+            cursor (int): Position to start from (0, or a previous next_cursor).
+            limit (int): Max number of evaluations returned.
+
+        Returns:
+            dict: `items` (list of evaluations) and `next_cursor` (None at the end).
         """
-        return self.truth_vectors
+        with self._lock:
+            self._expire()
+            first = self._recorded - len(self.truth_vectors)
+            start = max(cursor, first) - first
+            items = list(islice(self.truth_vectors, start, start + limit))
+            end = first + start + len(items)
+            return {"items": items, "next_cursor": end if end < self._recorded else None}
 
     def clear_history(self):
         """
-        Clears the stored truth vectors.
+        Clears the stored truth vectors (running statistics are kept).
         """
-        self.truth_vectors = []
+        with self._lock:
+            self.truth_vectors.clear()
+            self._recorded_at.clear()
         return "[Judgment memory cleared]"
 
-    def _check_logical_consistency(self, claim):
+    def export_state(self):
+        """
+        Returns the history and running statistics, for snapshots.
+        """
+        with self._lock:
+            self._expire()
+            return {"history": list(self.truth_vectors), "stats": self.stats.to_dict()}
+
+    def restore_state(self, state):
+        """
+        Restores history and statistics saved by export_state(). Restored
+        evaluations count as recorded now for `history_max_age`.
+        """
+        with self._lock:
+            self.truth_vectors.clear()
+            self._recorded_at.clear()
+            self.truth_vectors.extend(state["history"])
+            self._recorded_at.extend([time.monotonic()] * len(self.truth_vectors))
+            self._recorded = len(self.truth_vectors)
+            self.stats.load(state["stats"])
+
+    def statistics(self):
+        """
+        Returns aggregate statistics over all evaluations, including those
+        already evicted from the history.
+        """
+        with self._lock:
+            self._expire()
+            return {
+                **self.stats.summary(),
+                "history_size": len(self.truth_vectors),
+                "history_limit": self.history_limit,
+                "history_max_age": self.history_max_age,
+            }
+
+    def _check_logical_consistency(self, claim, found=None):
+        found = self._scan(claim) if found is None else found
         try:
-            if " and not " in claim or "not (" in claim:
+            if "logic" in found:
                 return {"check": "logic", "score": 0.2, "reason": "Potential contradiction syntax."}
             return {"check": "logic", "score": 1.0, "reason": "No contradiction detected."}
         except:
             return {"check": "logic", "score": 0.0, "reason": "Error during logic check."}
 
-    def _check_symbolic_depth(self, claim):
-        symbols = [s for s in ["∂", "∑", "∞", "∫", "↯", "→"] if s in claim]
+    def _check_symbolic_depth(self, claim, found=None):
+        found = self._scan(claim) if found is None else found
+        symbols = "symbolism" in found
         score = 0.9 if symbols else 0.4
         reason = "Symbolic richness detected." if symbols else "No universal symbols found."
         return {"check": "symbolism", "score": score, "reason": reason}
 
-    def _check_author_independence(self, claim):
-        suspicious = any(name in claim.lower() for name in ["plato", "darwin", "marx", "jesus", "confucius"])
+    def _check_author_independence(self, claim, found=None):
+        found = self._scan(claim) if found is None else found
+        suspicious = "authorship bias" in found
         score = 0.3 if suspicious else 1.0
         reason = "Contains named authority; penalized for bias." if suspicious else "Claim stands independently."
         return {"check": "authorship bias", "score": score, "reason": reason}
 
     def _check_semantic_stability(self, claim):
-        short = len(claim) < 140 and all(x.isprintable() for x in claim)
+        short = len(claim) < 140 and claim.isprintable()
         return {
             "check": "semantic clarity",
             "score": 1.0 if short else 0.6,
             "reason": "Claim is semantically stable." if short else "Too long or cluttered; weakens clarity."
         }
 
-    def _check_emergence_criteria(self, claim):
-        domains = ["math", "ethics", "logic", "biology", "physics", "metaphysics"]
-        found = any(d in claim.lower() for d in domains)
+    def _check_emergence_criteria(self, claim, found=None):
+        found = self._scan(claim) if found is None else found
+        emergent = "emergence" in found
         return {
             "check": "emergence",
-            "score": 0.8 if found else 0.4,
-            "reason": "Concept emerges across domains." if found else "Concept not yet emergent."
+            "score": 0.8 if emergent else 0.4,
+            "reason": "Concept emerges across domains." if emergent else "Concept not yet emergent."
         }
@@ -1,21 +1,153 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from fastapi import FastAPI, UploadFile, File, Query
+from fastapi import FastAPI, UploadFile, File, Query, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 import os
+import json
+import queue
+import shutil
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 # --- Sully Core ---
 from sully import Sully
+from sully_engine.storage import SQLiteBackend
+from sully_engine.metrics import REGISTRY
+from sully_engine.kernel_modules.ingest_jobs import IngestJobQueue
+from sully_engine.kernel_modules.response_cache import ResponseCache, etag, etag_matches
 
 # --- FastAPI App ---
 app = FastAPI()
-sully = Sully()
+# Set SULLY_STATE_DB to share codex, memory, paradoxes and mappings between
+# uvicorn workers through one SQLite database.
+STATE_DB = os.getenv("SULLY_STATE_DB")
+sully = Sully(backend=SQLiteBackend(STATE_DB) if STATE_DB else None)
+
+# Set SULLY_SNAPSHOT to warm-start from (and save on shutdown to) a snapshot.
+SNAPSHOT = os.getenv("SULLY_SNAPSHOT")
+if SNAPSHOT and os.path.exists(SNAPSHOT) and os.path.getsize(SNAPSHOT) > 0:
+    sully.load_snapshot(SNAPSHOT)
+
+@app.on_event("shutdown")
+def save_snapshot_on_shutdown():
+    if SNAPSHOT:
+        sully.save_snapshot(SNAPSHOT)
+
+# Synchronous Sully work runs here so a slow request never stalls the event loop.
+blocking_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SULLY_API_THREADS", "8")),
+    thread_name_prefix="sully-api",
+)
+
+async def run_blocking(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_pool, partial(fn, *args, **kwargs))
+
+# Rendered translate/paradox responses, keyed by the revision of the data they
+# were computed from so that add_mapping / ParadoxLibrary.add invalidate them.
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("SULLY_RESPONSE_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("SULLY_RESPONSE_CACHE_TTL", "300")),
+)
+
+def conditional_json(request, body, tag):
+    headers = {"ETag": tag}
+    if etag_matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+async def cached_json(request, key, compute):
+    # key() reads a revision, which may query the shared backend, so the
+    # whole lookup runs on the blocking pool.
+    def lookup():
+        cache_key = key()
+        cached = response_cache.get(cache_key)
+        if cached is None:
+            body = JSONResponse(compute()).body
+            cached = (body, etag(body))
+            response_cache.put(cache_key, cached)
+        return cached
+    return conditional_json(request, *await run_blocking(lookup))
+
+# Collections with a page(cursor, limit) method are listed one page at a time
+# and exported as NDJSON streamed page by page, so no request builds a whole
+# collection in memory.
+MAX_PAGE_SIZE = 1000
+EXPORT_PAGE_SIZE = 500
+
+def ndjson_export(page, to_records):
+    def lines():
+        cursor = 0
+        while cursor is not None:
+            result = page(cursor, EXPORT_PAGE_SIZE)
+            yield "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n"
+                          for r in to_records(result["items"]))
+            cursor = result["next_cursor"]
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def topic_records(items):
+    return ({"topic": topic, "entry": entry} for topic, entry in items.items())
+
+UPLOAD_DIR = "temp_uploads"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def ingest_upload(file_path, progress):
+    # Uploads are stored under their file name, so re-uploading a book
+    # replaces it; the per-job upload directory goes once the job ends.
+    try:
+        return sully.ingest_and_store_text(file_path, progress, key=os.path.basename(file_path))
+    finally:
+        shutil.rmtree(os.path.dirname(file_path), ignore_errors=True)
+
+ingest_jobs = IngestJobQueue(
+    ingest_upload,
+    workers=int(os.getenv("SULLY_INGEST_WORKERS", "1")),
+    max_pending=int(os.getenv("SULLY_INGEST_QUEUE", "16")),
+)
+
+# --- Metrics ---
+# SULLY_METRICS=0 turns off stage timing and the /metrics endpoint.
+METRICS_ENABLED = os.getenv("SULLY_METRICS", "1") != "0"
+REGISTRY.enabled = METRICS_ENABLED
+
+def corpus_bytes():
+    stats = sully.corpus.stats()
+    return {"live": stats["live_bytes"], "superseded": stats["garbage_bytes"]}
+
+if METRICS_ENABLED:
+    REGISTRY.gauge("sully_codex_entries", "Entries in the symbolic codex.", lambda: len(sully.codex.entries))
+    REGISTRY.gauge("sully_memory_entries", "Queries in search memory.", lambda: len(sully.memory.storage))
+    REGISTRY.gauge("sully_judgment_history", "Evaluations retained in judgment history.",
+                   lambda: len(sully.judgment.truth_vectors))
+    REGISTRY.gauge("sully_math_mappings", "Symbolic-to-math mappings.", lambda: len(sully.translator.math_mappings))
+    REGISTRY.gauge("sully_paradoxes", "Paradoxes in the library.", lambda: len(sully.paradox.paradoxes))
+    REGISTRY.gauge("sully_knowledge_items", "Items in in-process knowledge.", lambda: len(sully.knowledge))
+    REGISTRY.gauge("sully_ingested_documents", "Documents in the ingested corpus.", lambda: len(sully.corpus))
+    REGISTRY.gauge("sully_indexed_passages", "Ingested passages searchable by reason().", lambda: len(sully.passages))
+    REGISTRY.gauge("sully_corpus_bytes", "Bytes of ingested text on disk, by state.", corpus_bytes,
+                   labelnames=("state",))
+    REGISTRY.gauge("sully_ingest_queue_depth", "Ingestion jobs waiting for a worker.", ingest_jobs.queue_depth)
+    REGISTRY.gauge("sully_response_cache_entries", "Rendered responses held in the cache.",
+                   lambda: response_cache.stats()["entries"])
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 # --- Pydantic Models ---
 class ChatPrompt(BaseModel):
     message: str
     tone: str = "emergent"
 
+class ChatBatch(BaseModel):
+    messages: list[str]
+    tone: str = "emergent"
+
+class ClaimBatch(BaseModel):
+    claims: list[str]
+
 class NewWord(BaseModel):
     term: str
     meaning: str
@@ -28,9 +160,18 @@ async def get_identity():
 # --- Chat ---
 @app.post("/api/sully/chat")
 async def chat_with_sully(prompt: ChatPrompt):
-    result = sully.reason(prompt.message, prompt.tone)
+    result = await run_blocking(sully.reason, prompt.message, prompt.tone)
     return result
 
+@app.post("/api/sully/chat/batch")
+async def chat_batch(batch: ChatBatch):
+    return {"results": await run_blocking(sully.reason_batch, batch.messages, batch.tone)}
+
+@app.get("/api/sully/analyze")
+async def analyze(phrase: str = Query(...), cursor: int = Query(0, ge=0),
+                  limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)):
+    return await run_blocking(sully.analyze, phrase, cursor, limit)
+
 # --- Dictionary ---
 @app.get("/api/sully/words")
 async def word_count():
@@ -43,51 +184,161 @@ async def define_word(new_word: NewWord):
 
 # --- Dream ---
 @app.get("/api/sully/dream")
-async def dream(seed: str = Query(...)):
-    return sully.dream(seed)
+async def dream(seed: str = Query(...), variant: int = 0):
+    return await run_blocking(sully.dream, seed, variant)
+
+@app.get("/api/sully/dreamscape/stream")
+async def stream_dreamscape(seed: str = Query(...), depth: int = Query(3, ge=0, le=12),
+                            budget: int = Query(40, ge=1, le=2000), branching: int = Query(2, ge=1, le=8),
+                            variant: int = 0):
+    # Dreams are seeded by the request, so a finished stream is cached and
+    # replayed; otherwise segments are sent as they are generated.
+    key = ("dreamscape", seed, depth, budget, branching, variant)
+
+    def events():
+        segments = response_cache.get(key)
+        generated = segments is None
+        if generated:
+            segments = []
+            source = sully.dream_core.iter_dreamscape(seed, depth, budget, branching, variant)
+        else:
+            source = iter(segments)
+        for segment in source:
+            if generated:
+                segments.append(segment)
+            yield f"event: segment\ndata: {json.dumps(segment, ensure_ascii=False)}\n\n"
+        if generated:
+            response_cache.put(key, segments)
+        yield f"event: end\ndata: {json.dumps({'seed': seed, 'segments': len(segments)})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
 # --- Claim Evaluation ---
 @app.post("/api/sully/evaluate")
-async def evaluate_claim(prompt: ChatPrompt):
-    result = sully.evaluate_claim(prompt.message)
-    return result
+async def evaluate_claim(prompt: ChatPrompt, request: Request):
+    # Verdicts are memoized by the judgment protocol, but every call must
+    # still be recorded in its history, so only the ETag check applies here.
+    result = await run_blocking(sully.evaluate_claim, prompt.message)
+    body = JSONResponse(result).body
+    return conditional_json(request, body, etag(body))
+
+@app.post("/api/sully/evaluate/batch")
+async def evaluate_claims(batch: ClaimBatch):
+    return {"results": await run_blocking(sully.evaluate_claims, batch.claims)}
+
+@app.get("/api/sully/evaluate/stats")
+async def evaluation_stats():
+    return await run_blocking(sully.judgment_stats)
+
+@app.get("/api/sully/evaluate/history")
+async def evaluation_history(cursor: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)):
+    return await run_blocking(sully.judgment.history_page, cursor, limit)
+
+@app.get("/api/sully/evaluate/history/export")
+async def export_evaluation_history():
+    return ndjson_export(sully.judgment.history_page, iter)
 
 # --- Math Translation ---
 @app.get("/api/sully/translate")
-async def translate_math(phrase: str = Query(...)):
-    return {
+async def translate_math(request: Request, phrase: str = Query(...)):
+    key = lambda: ("translate", phrase, sully.translator.revision())
+    return await cached_json(request, key, lambda: {
         "original": phrase,
         "translation": sully.translate_math(phrase)
-    }
+    })
 
 # --- Fusion ---
 @app.post("/api/sully/fuse")
 async def fuse_symbols(inputs: list[str]):
     return {
-        "fusion_result": sully.fuse(*inputs)
+        "fusion_result": await run_blocking(sully.fuse, *inputs)
     }
 
 # --- Paradox Reveal ---
 @app.get("/api/sully/paradox")
-async def reveal_paradox(topic: str = Query(...)):
-    return {
+async def reveal_paradox(request: Request, topic: str = Query(...)):
+    key = lambda: ("paradox", topic, sully.paradox.revision())
+    return await cached_json(request, key, lambda: {
         "topic": topic,
         "paradox": sully.reveal_paradox(topic)
-    }
+    })
+
+@app.get("/api/sully/paradoxes")
+async def list_paradoxes(cursor: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)):
+    return await run_blocking(sully.paradox.page, cursor, limit)
+
+@app.get("/api/sully/paradoxes/export")
+async def export_paradoxes():
+    return ndjson_export(sully.paradox.page, topic_records)
+
+# --- Codex and Memory ---
+@app.get("/api/sully/codex")
+async def list_codex(cursor: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)):
+    return await run_blocking(sully.codex.page, cursor, limit)
+
+@app.get("/api/sully/codex/export")
+async def export_codex():
+    return ndjson_export(sully.codex.page, topic_records)
+
+@app.get("/api/sully/memory")
+async def list_memory(cursor: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)):
+    return await run_blocking(sully.memory.page, cursor, limit)
+
+@app.get("/api/sully/memory/export")
+async def export_memory():
+    return ndjson_export(sully.memory.page, iter)
+
+# --- Snapshot ---
+@app.post("/api/sully/snapshot")
+async def save_snapshot():
+    path = SNAPSHOT or "sully_state.snapshot"
+    sections = await run_blocking(sully.save_snapshot, path)
+    return {"path": path, "bytes": sum(sections.values()), "sections": sections}
 
 # --- Book Ingestion via Upload ---
-@app.post("/api/sully/ingest")
+@app.post("/api/sully/ingest", status_code=202)
 async def ingest_book(file: UploadFile = File(...)):
-    contents = await file.read()
-    upload_dir = "temp_uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, file.filename)
+    filename = os.path.basename(file.filename or "")
+    if not filename:
+        raise HTTPException(status_code=400, detail="Upload needs a file name.")
 
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    job_id = ingest_jobs.new_job_id()
+    job_dir = os.path.join(UPLOAD_DIR, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    file_path = os.path.join(job_dir, filename)
 
-    result = sully.ingest_and_store_text(file_path)
-    return {
-        "status": result,
-        "length": len(contents)
-    }
\ No newline at end of file
+    length = 0
+    try:
+        f = await run_blocking(open, file_path, "wb")
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await run_blocking(f.write, chunk)
+                length += len(chunk)
+        finally:
+            await run_blocking(f.close)
+        job = ingest_jobs.submit(file_path, job_id=job_id, filename=filename)
+    except queue.Full:
+        await run_blocking(shutil.rmtree, job_dir, ignore_errors=True)
+        raise HTTPException(status_code=503, detail="Ingestion queue is full; retry later.")
+    except BaseException:
+        await run_blocking(shutil.rmtree, job_dir, ignore_errors=True)
+        raise
+
+    return {**job, "length": length}
+
+@app.get("/api/sully/ingest/{job_id}")
+async def ingest_status(job_id: str):
+    job = ingest_jobs.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown ingestion job.")
+    return job
+
+@app.get("/api/sully/ingest/{job_id}/result")
+async def ingest_result(job_id: str):
+    job = ingest_jobs.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown ingestion job.")
+    if job["status"] not in ("done", "failed"):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}.")
+    return {**job, "result": ingest_jobs.result(job_id)}
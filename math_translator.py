@@ -1,18 +1,132 @@
 # 🔢 Symbolic-to-Mathematical Expression Translator
 
+import threading
+from types import MappingProxyType
+
+# Phrases at least this long are bucketed by their first HEAD characters.
+HEAD = 4
+
+
 class SymbolicMathTranslator:
     """
     Translates symbolic or poetic phrases into mathematical representations.
+
+    Mappings are indexed by their leading characters and length, so a
+    translation probes only the phrase lengths that can start at each
+    position of the input instead of testing every known mapping.
+
+    Mappings change only through add_mapping(), update_mappings() and
+    restore(), which keep the index and the revision (that keys cached
+    translations) current; `math_mappings` is a read-only view.
+
+    With a storage backend, mappings added by any process are shared.
     """
 
-    def __init__(self):
-        self.math_mappings = {
+    def __init__(self, backend=None):
+        self._mappings = {
             "infinity": "lim_{x→∞}",
             "change": "d/dx",
             "area under curve": "∫ f(x) dx",
             "growth": "f'(x) > 0",
             "equilibrium": "∇ · F = 0",
         }
+        self._lock = threading.RLock()
+        self._revision = 0
+
+        self.backend = backend
+        self._epoch = 0
+        self._version = 0
+        if backend is not None:
+            for phrase, math_form in self._mappings.items():
+                backend.put("math_mappings", phrase, math_form, overwrite=False)
+            self._mappings = {}
+        self._reindex()
+        with self._lock:
+            self._sync()
+
+    @property
+    def math_mappings(self):
+        """
+        Read-only view of the symbolic phrase -> math form mappings.
+        """
+        return MappingProxyType(self._mappings)
+
+    def _reindex(self):
+        """
+        Rebuilds the phrase index from the mappings.
+        """
+        self._rank = {}
+        self._short = {}  # length -> count, for phrases shorter than HEAD
+        self._heads = {}  # first HEAD chars -> {length: count}
+        for phrase in self._mappings:
+            self._index_phrase(phrase)
+
+    def _index_phrase(self, phrase):
+        """
+        Adds one phrase to the index in O(1).
+        """
+        if phrase in self._rank:
+            return
+        self._rank[phrase] = len(self._rank)
+        if len(phrase) < HEAD:
+            self._short[len(phrase)] = self._short.get(len(phrase), 0) + 1
+        else:
+            lengths = self._heads.setdefault(phrase[:HEAD], {})
+            lengths[len(phrase)] = lengths.get(len(phrase), 0) + 1
+
+    def _set(self, phrase, math_form):
+        """
+        Stores one mapping and indexes it in O(1). Caller holds the lock.
+        """
+        self._mappings[phrase] = math_form
+        self._index_phrase(phrase)
+
+    def _sync(self):
+        """
+        Applies mappings written to the backend since the last sync. Caller
+        holds the lock.
+        """
+        if self.backend is None:
+            return
+        epoch, self._version, rows = self.backend.changes("math_mappings", self._epoch, self._version)
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self._mappings = {}
+            self._reindex()
+            self._revision += 1
+        for phrase, math_form in rows:
+            self._set(phrase, math_form)
+        if rows:
+            self._revision += 1
+
+    def revision(self):
+        """
+        Returns a counter that changes whenever the mappings do, for keying
+        cached translations.
+        """
+        with self._lock:
+            self._sync()
+            return self._revision
+
+    def _find(self, text):
+        """
+        Returns the mapped phrases occurring in the text, in mapping order.
+        Caller holds the lock.
+        """
+        mappings = self._mappings
+        heads = self._heads.get
+        short = [n for n in self._short if n]
+        hits = {""} if 0 in self._short else set()
+
+        for i in range(len(text)):
+            for n in short:
+                if text[i:i + n] in mappings:
+                    hits.add(text[i:i + n])
+            for n in heads(text[i:i + HEAD], ()):
+                if text[i:i + n] in mappings:
+                    hits.add(text[i:i + n])
+
+        return sorted(hits, key=self._rank.__getitem__)
 
     def translate(self, phrase):
         """
@@ -25,11 +139,9 @@ class SymbolicMathTranslator:
             dict: Matches and formatted explanation string.
         """
         phrase_lower = phrase.lower()
-        matches = {}
-
-        for word, symbol in self.math_mappings.items():
-            if word in phrase_lower:
-                matches[word] = symbol
+        with self._lock:
+            self._sync()
+            matches = {word: self._mappings[word] for word in self._find(phrase_lower)}
 
         if not matches:
             return {
@@ -43,6 +155,23 @@ class SymbolicMathTranslator:
             "explanation": explanation
         }
 
+    def restore(self, mappings):
+        """
+        Replaces all mappings with saved ones.
+        """
+        with self._lock:
+            self._mappings = dict(mappings)
+            self._reindex()
+            self._revision += 1
+
+    def export_mappings(self):
+        """
+        Returns a copy of all mappings (e.g. for a snapshot).
+        """
+        with self._lock:
+            self._sync()
+            return dict(self._mappings)
+
     def add_mapping(self, symbol_phrase, math_form):
         """
         Adds a new symbolic → math mapping at runtime.
@@ -54,5 +183,34 @@ class SymbolicMathTranslator:
         Returns:
             str: Confirmation of the mapping added.
         """
-        self.math_mappings[symbol_phrase.lower()] = math_form
-        return f"Mapping added: '{symbol_phrase}' → '{math_form}'"
\ No newline at end of file
+        phrase = symbol_phrase.lower()
+        if self.backend is not None:
+            self.backend.put("math_mappings", phrase, math_form)
+        with self._lock:
+            if self.backend is None:
+                self._set(phrase, math_form)
+                self._revision += 1
+            self._sync()
+        return f"Mapping added: '{symbol_phrase}' → '{math_form}'"
+
+    def update_mappings(self, mappings):
+        """
+        Adds or replaces many symbolic → math mappings at once.
+
+        Args:
+            mappings (dict): Symbolic phrase -> math form.
+
+        Returns:
+            int: Number of mappings written.
+        """
+        mappings = {phrase.lower(): math_form for phrase, math_form in mappings.items()}
+        if self.backend is not None:
+            for phrase, math_form in mappings.items():
+                self.backend.put("math_mappings", phrase, math_form)
+        with self._lock:
+            if self.backend is None:
+                for phrase, math_form in mappings.items():
+                    self._set(phrase, math_form)
+                self._revision += 1
+            self._sync()
+        return len(mappings)
\ No newline at end of file
@@ -3,21 +3,94 @@
 # sully_engine/memory.py
 # 🧠 Sully's Searchable Symbolic Memory System
 
+import heapq
+import threading
 from datetime import datetime
+from .ngram_index import TrigramIndex
 
 class SullySearchMemory:
-    def __init__(self):
+    def __init__(self, backend=None):
         self.storage = []
+        self._queries = []  # position -> query text, checked by search() without decoding entries
+        self._index = TrigramIndex()
+        self._lock = threading.RLock()
+
+        # Optional shared backend: queries from every process land in one log.
+        self.backend = backend
+        self._epoch = 0
+        self._version = 0
+        with self._lock:
+            self._sync()
 
     def store_query(self, query, result):
         """
         Stores a symbolic query and its result in memory, with a timestamp.
         """
-        self.storage.append({
+        entry = {
             "query": query,
             "result": result,
             "timestamp": datetime.now().isoformat()
-        })
+        }
+        if self.backend is not None:
+            self.backend.append("memory", entry)
+        with self._lock:
+            if self.backend is None:
+                self._apply(entry)
+            self._sync()
+
+    def store_queries(self, pairs):
+        """
+        Stores many (query, result) pairs in one append, in order.
+        """
+        now = datetime.now().isoformat()
+        entries = [{"query": query, "result": result, "timestamp": now} for query, result in pairs]
+        if self.backend is not None:
+            self.backend.extend("memory", entries)
+        with self._lock:
+            if self.backend is None:
+                for entry in entries:
+                    self._apply(entry)
+            self._sync()
+
+    def restore(self, storage, index_base=None, queries=None):
+        """
+        Replaces memory with restored entries, e.g. a snapshot-backed
+        RecordList with its mapped trigram postings and query texts (each
+        rebuilt from the entries if omitted).
+        """
+        with self._lock:
+            self.storage = storage
+            self._queries = queries if queries is not None else [entry["query"] for entry in storage]
+            self._index.clear()
+            if index_base is not None:
+                self._index.base = index_base
+            else:
+                for i, entry in enumerate(storage):
+                    self._index.add(i, entry["query"].lower())
+
+    def _apply(self, entry):
+        """
+        Appends an entry locally and indexes it. Caller holds the lock.
+        """
+        self._index.add(len(self.storage), entry["query"].lower())
+        self.storage.append(entry)
+        self._queries.append(entry["query"])
+
+    def _sync(self):
+        """
+        Applies queries appended to the backend since the last sync. Caller
+        holds the lock.
+        """
+        if self.backend is None:
+            return
+        epoch, self._version, rows = self.backend.changes("memory", self._epoch, self._version)
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self.storage = []
+            self._queries = []
+            self._index.clear()
+        for _, entry in rows:
+            self._apply(entry)
 
     def search(self, keyword, case_sensitive=False, limit=None):
         """
@@ -32,26 +105,66 @@ class SullySearchMemory:
             dict: Indexed matches from memory.
         """
         matches = {}
-        for i, entry in enumerate(self.storage):
-            haystack = entry["query"] if case_sensitive else entry["query"].lower()
-            needle = keyword if case_sensitive else keyword.lower()
+        needle = keyword if case_sensitive else keyword.lower()
+
+        # The index holds lowercased queries, so a lowercased needle yields a
+        # candidate superset for both modes; each candidate is verified below.
+        with self._lock:
+            self._sync()
+            candidates = list(self._index.candidates(keyword.lower()))
+            storage, queries = self.storage, self._queries
+        heapq.heapify(candidates)
+
+        # Entries are append-only, so verifying against the snapshot is safe.
+        # Only matching entries are fetched (and decoded, if snapshot-backed).
+        while candidates:
+            i = heapq.heappop(candidates)
+            query = queries[i]
+            haystack = query if case_sensitive else query.lower()
 
             if needle in haystack:
-                matches[i] = entry
+                matches[i] = storage[i]
                 if limit and len(matches) >= limit:
                     break
 
         return matches
 
+    def page(self, cursor=0, limit=100):
+        """
+        Returns one page of memory, oldest first. Memory is append-only, so
+        a cursor stays valid as new queries arrive.
+
+        Args:
+            cursor (int): Position to start from (0, or a previous next_cursor).
+            limit (int): Max number of entries returned.
+
+        Returns:
+            dict: `items` (list of entries) and `next_cursor` (None at the end).
+        """
+        with self._lock:
+            self._sync()
+            items = self.storage[cursor:cursor + limit]
+            end = cursor + len(items)
+            return {"items": items, "next_cursor": end if end < len(self.storage) else None}
+
     def export_memory(self):
         """
         Returns the entire memory as a list of entries (for JSON export).
         """
-        return self.storage
+        with self._lock:
+            self._sync()
+            return list(self.storage)
 
     def clear_memory(self):
         """
         Clears all stored symbolic queries and results.
         """
-        self.storage = []
+        if self.backend is not None:
+            self.backend.clear("memory")
+        with self._lock:
+            if self.backend is None:
+                self.storage = []
+                self._queries = []
+                self._index.clear()
+            self._sync()
         return "[Memory cleared]"
@@ -0,0 +1,194 @@
+# sully_engine/metrics.py
+# 📈 Sully's Metrics — Stage timings, counters and size gauges in Prometheus text format
+
+import bisect
+import threading
+import time
+
+# Seconds; spans fast in-memory stages (~µs) up to whole-book OCR.
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    """
+    Monotonic counter, optionally split by label values.
+    """
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram of observed values, split by label values.
+    """
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, labels + (bound,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {series[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time, so nothing is tracked
+    between scrapes. The callback returns a number, or a dict of
+    label value (or tuple of them) -> number.
+    """
+
+    def __init__(self, name, help, fn, labelnames=()):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labelnames = tuple(labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        value = self.fn()
+        if isinstance(value, dict):
+            for labels, v in sorted(value.items()):
+                labels = labels if isinstance(labels, tuple) else (labels,)
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {v}")
+        else:
+            lines.append(f"{self.name} {value}")
+        return lines
+
+
+class Stopwatch:
+    """
+    Times consecutive stages: each lap() records the time since the
+    previous lap (or since the stopwatch started) under that stage name.
+    """
+
+    __slots__ = ("histogram", "last")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.histogram.observe(now - self.last, stage)
+        self.last = now
+
+
+class _NullStopwatch:
+    """
+    Stand-in handed out while metrics are off; lap() does nothing.
+    """
+
+    __slots__ = ()
+
+    def lap(self, stage):
+        pass
+
+
+NULL_STOPWATCH = _NullStopwatch()
+
+
+class MetricsRegistry:
+    """
+    Holds every metric and renders them for a /metrics scrape.
+
+    While `enabled` is False, instrumented code gets NULL_STOPWATCH and
+    skips counter updates, so the only cost left is one attribute check.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name, help, fn, labelnames=()):
+        """
+        Registers (or replaces) a gauge read from `fn` at scrape time.
+        """
+        with self._lock:
+            self._metrics[name] = Gauge(name, help, fn, labelnames)
+            return self._metrics[name]
+
+    def stopwatch(self, histogram):
+        """
+        Returns a running Stopwatch, or NULL_STOPWATCH while disabled.
+        """
+        return Stopwatch(histogram) if self.enabled else NULL_STOPWATCH
+
+    def render(self):
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
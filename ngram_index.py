@@ -0,0 +1,103 @@
+# sully_engine/ngram_index.py
+# 🧩 Trigram Index — Sublinear substring lookup for Sully's stores
+
+from collections import defaultdict
+
+PAD = "\x00\x00"
+
+
+def trigrams(text):
+    """
+    Returns the set of trigrams of a text, padded so that short texts
+    (and short search needles) still produce grams.
+    """
+    padded = f"{PAD}{text}{PAD}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Maps trigrams to the set of keys whose text contains them.
+    Used to narrow substring searches down to a small candidate set,
+    which the caller then verifies with a plain `in` test.
+
+    An optional read-only `base` (e.g. postings mapped from a snapshot,
+    with `get(gram)` and `containing(needle)`) is consulted alongside the
+    in-memory postings; remove() only affects in-memory postings.
+    """
+
+    def __init__(self, base=None):
+        self.postings = defaultdict(set)
+        self.base = base
+
+    def _keys(self, gram):
+        keys = self.postings.get(gram)
+        if self.base is None:
+            return keys
+        base = self.base.get(gram)
+        if not base:
+            return keys
+        return base | keys if keys else base
+
+    def add(self, key, text):
+        """
+        Indexes a text under the given key.
+        """
+        for gram in trigrams(text):
+            self.postings[gram].add(key)
+
+    def remove(self, key, text):
+        """
+        Removes a key previously indexed with the given text.
+        """
+        for gram in trigrams(text):
+            keys = self.postings.get(gram)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+    def candidates(self, needle):
+        """
+        Returns the keys whose text may contain the needle.
+
+        Args:
+            needle (str): Substring being searched for.
+
+        Returns:
+            set: Candidate keys (a superset of the true matches).
+        """
+        if len(needle) >= 3:
+            grams = [needle[i:i + 3] for i in range(len(needle) - 2)]
+            postings = []
+            for gram in set(grams):
+                keys = self._keys(gram)
+                if not keys:
+                    return set()
+                postings.append(keys)
+            postings.sort(key=len)
+            result = set(postings[0])
+            for keys in postings[1:]:
+                result &= keys
+                if not result:
+                    break
+            return result
+
+        # Short needles: union every padded gram that contains the needle.
+        # Cost depends on the gram vocabulary, not on the number of keys.
+        result = set()
+        for gram, keys in self.postings.items():
+            if needle in gram:
+                result |= keys
+        if self.base is not None:
+            for keys in self.base.containing(needle):
+                result.update(keys)
+        return result
+
+    def clear(self):
+        """
+        Drops all indexed grams, including the base.
+        """
+        self.postings = defaultdict(set)
+        self.base = None
@@ -1,60 +1,292 @@
 # sully_engine/kernel_modules/ocr_engine.py
 
-import pytesseract
-from pdf2image import convert_from_path
-from PIL import Image
-import numpy as np
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from ..metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+OCR_PAGE_SECONDS = REGISTRY.histogram("sully_ocr_page_seconds", "Tesseract time per OCRed page.")
+INGEST_STAGES = REGISTRY.histogram(
+    "sully_ingest_stage_seconds", "Time spent in each stage of document ingestion.", ("stage",)
+)
+INGEST_PAGES = REGISTRY.counter(
+    "sully_ingest_pages_total", "Pages ingested, by where their text came from.", ("source",)
+)
 
 # ✅ Tell Tesseract where to find the binary
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+# pytesseract, pdf2image and their PIL dependency are imported on first use,
+# so API workers that never OCR don't pay for loading them.
+_pytesseract = None
+
+
+def _tesseract():
+    """
+    Returns the pytesseract module, importing and configuring it once.
+    """
+    global _pytesseract
+    if _pytesseract is None:
+        import pytesseract
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+        _pytesseract = pytesseract
+    return _pytesseract
+
+
+def _init_worker():
+    """
+    Keeps each tesseract process single-threaded so pool workers don't
+    oversubscribe the cores they are meant to share.
+    """
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+def _ocr_page(image):
+    """
+    OCRs one page image. Top-level so it can be shipped to pool workers.
+
+    Returns:
+        tuple: (text, seconds spent in tesseract)
+    """
+    start = time.perf_counter()
+    text = _tesseract().image_to_string(image)
+    return text, time.perf_counter() - start
+
+
+class _InlinePool:
+    """
+    Runs OCR in-process behind the same submit() interface as the pool.
+    """
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class OCRResult:
+    """
+    Outcome of OCR over a document: per-page text and timings in page order.
+    """
+
+    def __init__(self, source, pages, seconds):
+        self.source = source
+        self.pages = pages
+        self.seconds = seconds
+
+    @property
+    def text(self):
+        return "\n".join(page["text"] for page in self.pages)
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "page_count": len(self.pages),
+            "seconds": round(self.seconds, 3),
+            "pages": [
+                {"page": p["page"], "characters": len(p["text"]), "seconds": round(p["seconds"], 3)}
+                for p in self.pages
+            ]
+        }
+
 
 class SullyOCREngine:
-    def extract_text_from_pdf(self, pdf_path):
+    def __init__(self, workers=None, dpi=200, batch_size=None, cache=None):
+        """
+        Args:
+            workers (int or None): OCR processes to run in parallel
+                (defaults to the CPU count; 1 runs in-process).
+            dpi (int): Resolution used to rasterize PDF pages.
+            batch_size (int or None): Pages rasterized at a time
+                (defaults to the worker count). At most two batches of
+                page images are held in memory at once.
+            cache (ExtractionCache or None): Reuses OCR text for pages whose
+                rendered pixels have been seen before.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.dpi = dpi
+        self.batch_size = batch_size or self.workers
+        self.cache = cache
+
+    def ocr_pdf(self, pdf_path, dpi=None, progress=None):
+        """
+        Rasterizes a PDF and OCRs its pages in parallel.
+
+        Args:
+            pdf_path (str): PDF to read.
+            dpi (int or None): Override the engine's rasterization DPI.
+            progress (callable or None): Called as `progress(done, total)`
+                after each page.
+
+        Returns:
+            OCRResult: Per-page text and timings, in page order.
+        """
+        start = time.perf_counter()
+        total = self.page_count(pdf_path) if progress else None
+        pages = []
+        for page in self.iter_ocr_pages(pdf_path, dpi=dpi):
+            pages.append(page)
+            if progress:
+                progress(page["page"], total)
+        return OCRResult(pdf_path, pages, time.perf_counter() - start)
+
+    def page_count(self, pdf_path):
+        """
+        Returns the number of pages in a PDF without rendering it.
+        """
+        from pdf2image import pdfinfo_from_path
+        return pdfinfo_from_path(pdf_path)["Pages"]
+
+    def iter_page_images(self, pdf_path, dpi=None, pages=None):
+        """
+        Rasterizes a PDF in batches of `batch_size` pages.
+
+        Args:
+            pages (list or None): 1-based page numbers to render, ascending
+                (defaults to every page).
+
+        Yields:
+            list: PIL images for the next batch of pages.
+        """
+        from pdf2image import convert_from_path
+
+        if pages is None:
+            pages = range(1, self.page_count(pdf_path) + 1)
+        pages = list(pages)
+
+        for start in range(0, len(pages), self.batch_size):
+            chunk = pages[start:start + self.batch_size]
+            watch = REGISTRY.stopwatch(INGEST_STAGES)
+            images = []
+            # Render each run of consecutive pages with a single call.
+            run_start = 0
+            for i in range(1, len(chunk) + 1):
+                if i == len(chunk) or chunk[i] != chunk[i - 1] + 1:
+                    images.extend(convert_from_path(
+                        pdf_path, dpi=dpi or self.dpi,
+                        first_page=chunk[run_start], last_page=chunk[i - 1]
+                    ))
+                    run_start = i
+            watch.lap("render")
+            yield images
+
+    def iter_ocr_pages(self, pdf_path, dpi=None, pages=None):
+        """
+        Streams OCR results page by page while later pages are still being
+        rasterized, so memory stays flat regardless of document length.
+
+        Args:
+            pages (list or None): 1-based page numbers to OCR, ascending
+                (defaults to every page).
+
+        Yields:
+            dict: {"page", "text", "seconds"} for each page, in page order.
+        """
+        if pages is None:
+            pages = range(1, self.page_count(pdf_path) + 1)
+        page_numbers = iter(pages)
+        batches = self.iter_page_images(pdf_path, dpi=dpi, pages=pages)
+
+        if self.workers <= 1:
+            pool = _InlinePool()
+        else:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        with pool:
+            pending = deque()
+            for batch in batches:
+                pending.extend(self._submit(pool, image) for image in batch)
+                del batch
+
+                # Drain down to one batch in flight before rendering the next.
+                while len(pending) > self.batch_size:
+                    page = next(page_numbers)
+                    text, seconds = self._resolve(pending.popleft())
+                    yield {"page": page, "text": text, "seconds": seconds}
+
+            while pending:
+                page = next(page_numbers)
+                text, seconds = self._resolve(pending.popleft())
+                yield {"page": page, "text": text, "seconds": seconds}
+
+    def _submit(self, pool, image):
+        """
+        Schedules OCR for a page unless its text is cached or already being
+        computed for another document.
+
+        Returns:
+            tuple: (future, timed) — timed futures resolve to (text, seconds),
+            others to the cached text alone.
+        """
+        if self.cache is None:
+            return pool.submit(_ocr_page, image), True
+
+        digest = self.cache.page_digest(image)
+        shared, leader = self.cache.claim("page", digest)
+        if not leader:
+            return shared, False
+
+        future = pool.submit(_ocr_page, image)
+        future.add_done_callback(lambda f: self._settle_page(digest, shared, f))
+        return future, True
+
+    def _settle_page(self, digest, shared, future):
+        error = future.exception()
+        text = None if error else future.result()[0]
+        self.cache.settle("page", digest, shared, text, error=error)
+
+    def _resolve(self, entry):
+        future, timed = entry
+        if timed:
+            text, seconds = future.result()
+            if REGISTRY.enabled:
+                OCR_PAGE_SECONDS.observe(seconds)
+                INGEST_PAGES.inc("ocr")
+            return text, seconds
+        if REGISTRY.enabled:
+            INGEST_PAGES.inc("page_cache")
+        return future.result(), 0.0
+
+    def extract_text_from_pdf(self, pdf_path, progress=None):
         """
         Convert PDF pages to images, then run OCR on each.
         Returns combined text.
         """
         try:
-            images = convert_from_path(pdf_path)
-            all_text = []
-
-            for i, img in enumerate(images):
-                text = pytesseract.image_to_string(img)
-                print(f"[OCR] Page {i+1} extracted. Length: {len(text)} characters")
-                all_text.append(text)
-
-            return "\n".join(all_text)
+            return self.ocr_pdf(pdf_path, progress=progress).text
 
         except Exception as e:
             return f"[OCR ERROR] {e}"
 
-    def autoflatten_image(self, image_path, output_path="flattened_temp.png"):
+    def autoflatten_image(self, image_path, output_path="flattened_temp.png", method="fast"):
         """
         Detect skew/rotation in an image and deskew it using OpenCV.
         Returns the path to the corrected image.
         """
         try:
             import cv2  # 🔁 Lazy import so no crash if unused
+            from .autoflatten import estimate_skew, min_area_rect_skew, rotate_image
 
             img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-            blur = cv2.GaussianBlur(img, (5, 5), 0)
-            _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-
-            coords = np.column_stack(np.where(thresh > 0))
-            angle = cv2.minAreaRect(coords)[-1]
-
-            if angle < -45:
-                angle = -(90 + angle)
-            else:
-                angle = -angle
-
-            (h, w) = img.shape[:2]
-            center = (w // 2, h // 2)
-            M = cv2.getRotationMatrix2D(center, angle, 1.0)
-            rotated = cv2.warpAffine(img, M, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+            angle = estimate_skew(img) if method == "fast" else min_area_rect_skew(img)
+            rotated = rotate_image(img, angle)
 
             cv2.imwrite(output_path, rotated)
-            print(f"[Flatten] Image saved to {output_path}")
+            logger.info("Flattened image saved to %s (deskewed %.2f°)", output_path, angle)
             return output_path
 
         except Exception as e:
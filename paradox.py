@@ -1,13 +1,17 @@
 # sully_engine/kernel_modules/paradox.py
 # ♾️ Sully's Paradox Library — Recursive contradictions and symbolic loops
 
+import threading
+
 class ParadoxLibrary:
     """
     A library of philosophical and symbolic paradoxes.
     Supports retrieval, creation, and exploration of recursive contradictions.
+
+    With a storage backend, the library is shared between processes.
     """
 
-    def __init__(self):
+    def __init__(self, backend=None):
         self.paradoxes = {
             "Infinity As Origin": {
                 "type": "temporal inversion",
@@ -16,6 +20,45 @@ class ParadoxLibrary:
                 "reframed": "We do not approach truth; we unfold it from ∞ inward.",
             }
         }
+        self._lock = threading.Lock()
+        self._revision = 0
+        self._topics = []  # insertion order, as of `_topics_revision`
+        self._topics_revision = None
+
+        self.backend = backend
+        self._epoch = 0
+        self._version = 0
+        if backend is not None:
+            for topic, entry in self.paradoxes.items():
+                backend.put("paradoxes", topic, entry, overwrite=False)
+            self.paradoxes = {}
+            with self._lock:
+                self._sync()
+
+    def _sync(self):
+        """
+        Applies paradoxes written to the backend since the last sync. Caller
+        holds the lock.
+        """
+        if self.backend is None:
+            return
+        epoch, self._version, rows = self.backend.changes("paradoxes", self._epoch, self._version)
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self.paradoxes = {}
+            self._revision += 1
+        if rows:
+            self.paradoxes.update(rows)
+            self._revision += 1
+
+    def revision(self):
+        """
+        Returns a counter that changes whenever a paradox is added, for
+        keying cached lookups.
+        """
+        with self._lock:
+            self._sync()
+            return self._revision
 
     def get(self, topic):
         """
@@ -28,8 +71,10 @@ class ParadoxLibrary:
         Returns:
             dict: A full paradox entry, or a prompt to attend inward.
         """
-        if topic in self.paradoxes:
-            return self.paradoxes[topic]
+        with self._lock:
+            self._sync()
+            if topic in self.paradoxes:
+                return self.paradoxes[topic]
         return {
             "topic": topic,
             "message": (
@@ -49,25 +94,70 @@ class ParadoxLibrary:
             reframed (str): Philosophical or poetic expression of it.
             tone (str): Mood or cognitive tone of the paradox.
         """
-        self.paradoxes[topic] = {
+        entry = {
             "type": type_,
             "description": description,
             "reframed": reframed,
             "tone": tone,
         }
+        if self.backend is not None:
+            self.backend.put("paradoxes", topic, entry)
+        with self._lock:
+            if self.backend is None:
+                self.paradoxes[topic] = entry
+                self._revision += 1
+            self._sync()
         return f"Paradox '{topic}' added."
 
+    def restore(self, paradoxes):
+        """
+        Replaces the library with saved paradoxes.
+        """
+        with self._lock:
+            self.paradoxes = dict(paradoxes)
+            self._revision += 1
+
     def list_paradoxes(self):
         """
         Returns a list of known paradox topic names.
         """
-        return list(self.paradoxes.keys())
+        with self._lock:
+            self._sync()
+            return list(self.paradoxes.keys())
+
+    def page(self, cursor=0, limit=100):
+        """
+        Returns one page of paradoxes in the order they were added.
+
+        Args:
+            cursor (int): Position to start from (0, or a previous next_cursor).
+            limit (int): Max number of paradoxes returned.
+
+        Returns:
+            dict: `items` (topic -> paradox) and `next_cursor` (None at the end).
+        """
+        with self._lock:
+            self._sync()
+            # Every change bumps the revision, so the topic list is rebuilt
+            # once per change rather than walked from the start per page.
+            if self._topics_revision != self._revision:
+                self._topics = list(self.paradoxes)
+                self._topics_revision = self._revision
+            topics = self._topics[cursor:cursor + limit]
+            end = cursor + len(topics)
+            return {
+                "items": {topic: self.paradoxes[topic] for topic in topics},
+                "next_cursor": end if end < len(self._topics) else None,
+            }
 
     def export(self):
         """
-        Returns the entire paradox dictionary for symbolic review/export.
+        Returns a copy of the paradox dictionary for symbolic review/export,
+        taken under the lock so writers can keep adding.
         """
-        return self.paradoxes
+        with self._lock:
+            self._sync()
+            return dict(self.paradoxes)
 
 
 # ========================
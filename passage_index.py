@@ -0,0 +1,556 @@
+# sully_engine/passage_index.py
+# 🔎 Passage Index — BM25 ranking over ingested corpus chunks
+
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+from itertools import compress
+
+from .snapshot import Snapshot, decode_text, encode_json, pack_records, write_sections
+
+TOKEN_RE = re.compile(r"\w+")
+EXCERPT_CHARS = 320
+SEGMENT_RE = re.compile(r"^passages-(\d{12})-(\d{12})\.seg$")
+
+
+def tokenize(text):
+    """
+    Returns the lowercased word tokens of a text.
+    """
+    return TOKEN_RE.findall(text.lower())
+
+
+def segment_name(first, end):
+    return f"passages-{first:012d}-{end:012d}.seg"
+
+
+class PassageSegment:
+    """
+    A persisted, read-only part of a PassageIndex covering chunk ids
+    [first, end), mapped from a snapshot-format file: sorted terms with
+    (start, count) spans into chunk id and term frequency postings, each
+    chunk's token length, and each chunk's term ids (so a superseded chunk
+    is retired without re-reading its text). Terms are found by binary
+    search, so opening a segment decodes nothing.
+    """
+
+    def __init__(self, path):
+        snapshot = Snapshot(path)
+        meta = snapshot.json("meta")
+        self.path = path
+        self.first = meta["first_chunk"]
+        self.end = meta["end_chunk"]
+        # Each term is stored with a trailing newline (tokens have none), so
+        # the whole vocabulary can also be decoded in one split.
+        self.terms = snapshot.records("terms", lambda buf: decode_text(buf[:-1]))
+        self._terms_data = snapshot.section("terms.data")
+        self.spans = snapshot.section("spans", "Q")
+        self.chunks = snapshot.section("chunks", "I")
+        self.freqs = snapshot.section("freqs", "H")
+        self.lengths = snapshot.section("lengths", "I")
+        self.chunk_terms = snapshot.records("chunk_terms", lambda buf: buf.cast("I"))
+
+    @property
+    def width(self):
+        return self.end - self.first
+
+    def term_list(self):
+        """
+        Returns every term of the segment, in sorted order.
+        """
+        return decode_text(self._terms_data).split("\n")[:-1]
+
+    def _find(self, term):
+        terms = self.terms
+        lo, hi = 0, len(terms)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = terms[mid]
+            if key < term:
+                lo = mid + 1
+            elif key > term:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def lookup(self, term):
+        """
+        Returns (chunk ids, term frequencies) for a term, or None.
+        """
+        i = self._find(term)
+        if i < 0:
+            return None
+        start, count = self.spans[2 * i], self.spans[2 * i + 1]
+        return self.chunks[start:start + count], self.freqs[start:start + count]
+
+    def terms_of(self, chunk_id):
+        """
+        Returns the distinct terms of a chunk in the segment.
+        """
+        return [self.terms[i] for i in self.chunk_terms[chunk_id - self.first]]
+
+    @staticmethod
+    def write(path, first, end, postings, chunk_terms, lengths):
+        """
+        Writes a segment for chunk ids [first, end) from in-memory
+        postings, keeping only the chunks in `chunk_terms` (the live ones);
+        other chunks in the range are written as empty.
+
+        Args:
+            postings (dict): term -> (array of chunk ids, array of term frequencies).
+            chunk_terms (dict): chunk id -> tuple of its distinct terms.
+            lengths (array): chunk id -> tokens.
+        """
+        kept = [chunk_id for chunk_id in chunk_terms if first <= chunk_id < end]
+        terms = []
+        spans, chunks, freqs = array("Q"), array("I"), array("H")
+        if sum(len(chunk_terms[i]) for i in kept) == sum(len(ids) for ids, _ in postings.values()):
+            # Every posting belongs to a kept chunk: copy them as they are.
+            for term in sorted(postings):
+                chunk_ids, tfs = postings[term]
+                spans.extend((len(chunks), len(chunk_ids)))
+                chunks.extend(chunk_ids)
+                freqs.extend(tfs)
+                terms.append(term)
+        else:
+            keep = bytearray(len(lengths))
+            for chunk_id in kept:
+                keep[chunk_id] = 1
+            for term in sorted(postings):
+                chunk_ids, tfs = postings[term]
+                mask = bytes(map(keep.__getitem__, chunk_ids))
+                start = len(chunks)
+                chunks.extend(compress(chunk_ids, mask))
+                if len(chunks) > start:
+                    freqs.extend(compress(tfs, mask))
+                    spans.extend((start, len(chunks) - start))
+                    terms.append(term)
+
+        ids = {term: i for i, term in enumerate(terms)}
+        kept_lengths, term_ids = array("I"), []
+        for chunk_id in range(first, end):
+            chunk = chunk_terms.get(chunk_id, ())
+            kept_lengths.append(lengths[chunk_id] if chunk_id in chunk_terms else 0)
+            term_ids.append(array("I", map(ids.__getitem__, chunk)).tobytes())
+        PassageSegment._write(path, first, end, terms, spans, chunks, freqs, kept_lengths, term_ids)
+
+    @staticmethod
+    def merge(path, segments):
+        """
+        Writes one segment holding consecutive `segments`, copying their
+        postings term by term (no text is re-read).
+        """
+        vocabularies = [segment.term_list() for segment in segments]
+        terms = sorted(set().union(*vocabularies))
+        ids = {term: i for i, term in enumerate(terms)}
+        sources = [[] for _ in terms]  # new term id -> [(segment, old term id)], in chunk order
+        for segment, vocabulary in zip(segments, vocabularies):
+            for old, term in enumerate(vocabulary):
+                sources[ids[term]].append((segment, old))
+
+        spans, chunks, freqs = array("Q"), array("I"), array("H")
+        for parts in sources:
+            start = len(chunks)
+            for segment, old in parts:
+                lo, count = segment.spans[2 * old], segment.spans[2 * old + 1]
+                chunks.frombytes(segment.chunks[lo:lo + count].cast("B"))
+                freqs.frombytes(segment.freqs[lo:lo + count].cast("B"))
+            spans.extend((start, len(chunks) - start))
+
+        lengths, chunk_terms = array("I"), []
+        for segment, vocabulary in zip(segments, vocabularies):
+            lengths.frombytes(segment.lengths.cast("B"))
+            remap = [ids[term] for term in vocabulary]
+            for old_ids in segment.chunk_terms:
+                chunk_terms.append(array("I", map(remap.__getitem__, old_ids)).tobytes())
+        PassageSegment._write(
+            path, segments[0].first, segments[-1].end, terms, spans, chunks, freqs, lengths, chunk_terms
+        )
+
+    @staticmethod
+    def _write(path, first, end, terms, spans, chunks, freqs, lengths, chunk_terms):
+        sections = {"meta": encode_json({"first_chunk": first, "end_chunk": end})}
+        sections["terms.offsets"], sections["terms.data"] = pack_records(f"{t}\n".encode("utf-8") for t in terms)
+        sections["spans"] = spans.tobytes()
+        sections["chunks"] = chunks.tobytes()
+        sections["freqs"] = freqs.tobytes()
+        sections["lengths"] = lengths.tobytes()
+        sections["chunk_terms.offsets"], sections["chunk_terms.data"] = pack_records(chunk_terms)
+        write_sections(path, sections)
+
+
+class PassageIndex:
+    """
+    Inverted index over the chunks of a CorpusStore, ranked with BM25.
+
+    Each chunk is a passage. Postings are compact arrays of chunk ids and
+    term frequencies; document frequencies and lengths are kept current as
+    documents are re-ingested, and postings of superseded chunks are
+    skipped at query time. Queries score only the chunks sharing a query
+    term and keep the best `k` with a bounded heap.
+
+    The index persists next to the corpus (in its "passages" directory) as
+    segments covering consecutive chunk ranges from chunk 0. Newly indexed
+    chunks are held in memory, with their terms, until
+    `flush_chunks` of them follow the last segment; they are then written
+    as a new segment, and segments of similar size are merged. A new
+    process maps the segments and only tokenizes the chunks after them.
+    """
+
+    def __init__(self, corpus, k1=1.2, b=0.75, max_df_ratio=0.5, flush_chunks=1024):
+        """
+        Args:
+            corpus (CorpusStore): Store whose chunks are indexed.
+            k1 (float): BM25 term-frequency saturation.
+            b (float): BM25 length normalization.
+            max_df_ratio (float): Query terms found in more than this share
+                of passages (near stopwords) are skipped when the query has
+                rarer terms, since scanning them costs the most and moves
+                rankings the least.
+            flush_chunks (int): Indexed chunks held in memory before they
+                are written as a segment.
+        """
+        self.corpus = corpus
+        self.k1 = k1
+        self.b = b
+        self.max_df_ratio = max_df_ratio
+        self.flush_chunks = flush_chunks
+        self.root = os.path.join(corpus.root, "passages")
+        os.makedirs(self.root, exist_ok=True)
+
+        self.segments = []  # PassageSegment, consecutive from chunk 0
+        self.base_end = 0  # chunks below this are covered by segments
+        self.postings = {}  # term -> (array of chunk ids, array of term frequencies), past the segments
+        self.df = Counter()  # term -> live passages containing it, beyond the segments' counts
+        self.lengths = array("I")  # chunk id -> tokens (0 if not indexed)
+        self.live = bytearray()  # chunk id -> 1 while its document version is current
+        self.passages = 0
+        self.total_length = 0
+        self.indexed = {}  # path -> chunk id range currently indexed
+        self._terms = {}  # chunk id -> its distinct terms, for live chunks past the segments
+        self._lock = threading.RLock()
+
+    # ----------------------------------------------------------------
+    # Indexing
+    # ----------------------------------------------------------------
+
+    def add_document(self, path):
+        """
+        Indexes the current version of a corpus document, retiring the
+        passages of any version indexed before.
+        """
+        with self._lock:
+            # Read under the lock: a version read before waiting for it may
+            # be superseded by an ingest that got the lock first.
+            chunk_ids = self.corpus.chunk_ids(path)
+            previous = self.indexed.get(path)
+            if previous == chunk_ids:
+                return
+            if previous is not None:
+                self._retire(previous)
+
+            if len(self.lengths) < self.corpus.chunk_count():
+                grow = self.corpus.chunk_count() - len(self.lengths)
+                self.lengths.extend([0] * grow)
+                self.live.extend(bytes(grow))
+
+            for chunk_id in chunk_ids:
+                self._index_chunk(chunk_id, Counter(tokenize(self.corpus.chunk_text(chunk_id))))
+            self.indexed[path] = chunk_ids
+            self._flush()
+
+    def _index_chunk(self, chunk_id, counts):
+        """
+        Adds a live chunk's term counts to the in-memory postings. Caller
+        holds the lock.
+        """
+        for term, n in counts.items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array("I"), array("H"))
+            entry[0].append(chunk_id)
+            entry[1].append(min(n, 0xFFFF))
+        self.df.update(counts.keys())
+        length = sum(counts.values())
+        self.lengths[chunk_id] = length
+        self.live[chunk_id] = 1
+        self.passages += 1
+        self.total_length += length
+        self._terms[chunk_id] = tuple(counts)
+
+    def _retire(self, chunk_ids):
+        """
+        Removes superseded passages from the statistics, using their stored
+        terms. Their postings stay in place and are skipped by search().
+        Caller holds the lock.
+        """
+        for chunk_id in chunk_ids:
+            if not self.live[chunk_id]:
+                continue
+            if chunk_id < self.base_end:
+                terms = self._segment_of(chunk_id).terms_of(chunk_id)
+            else:
+                terms = self._terms.pop(chunk_id)
+            self.df.subtract(terms)
+            self.live[chunk_id] = 0
+            self.passages -= 1
+            self.total_length -= self.lengths[chunk_id]
+
+    def _segment_of(self, chunk_id):
+        i = bisect.bisect_right([segment.first for segment in self.segments], chunk_id) - 1
+        return self.segments[i]
+
+    # ----------------------------------------------------------------
+    # Persistence
+    # ----------------------------------------------------------------
+
+    def _current(self, chunk_id):
+        """
+        Returns True if a chunk belongs to its path's current version.
+        """
+        doc_id = self.corpus.chunk_info(chunk_id)[0]
+        return self.corpus.documents[self.corpus.doc_paths[doc_id]]["doc_id"] == doc_id
+
+    def _chain(self):
+        """
+        Returns the segment files covering chunks from 0 without gaps,
+        preferring the widest (merged) segment at each step. Segments past
+        the corpus's committed chunks are ignored. Caller holds the corpus
+        lock.
+        """
+        widest = {}  # first chunk -> (end chunk, file name)
+        for name in os.listdir(self.root):
+            match = SEGMENT_RE.match(name)
+            if match:
+                first, end = int(match.group(1)), int(match.group(2))
+                if end > widest.get(first, (first, None))[0]:
+                    widest[first] = (end, name)
+
+        names, end = [], 0
+        self.corpus.refresh()
+        while end in widest and widest[end][0] <= self.corpus.chunk_count():
+            end, name = widest[end]
+            names.append(name)
+        return names
+
+    def _refresh_segments(self):
+        """
+        Loads segments written since the last check, by this or another
+        process. Caller holds the lock.
+        """
+        with self.corpus.locked():
+            names = self._chain()
+            loaded = {os.path.basename(segment.path): segment for segment in self.segments}
+            if names == list(loaded):
+                return
+            segments = []
+            for name in names:
+                segment = loaded.get(name)
+                if segment is None:
+                    try:
+                        segment = PassageSegment(os.path.join(self.root, name))
+                    except (OSError, ValueError, KeyError):
+                        break  # unreadable: rebuilt from the text on the next flush
+                segments.append(segment)
+        self._load(segments)
+
+    def _load(self, segments):
+        """
+        Makes `segments` the persisted base and rebuilds the statistics
+        around it; chunks they cover leave the in-memory postings. Caller
+        holds the lock.
+        """
+        self.segments = segments
+        self.base_end = segments[-1].end if segments else 0
+        size = self.corpus.chunk_count()
+        tail_lengths = self.lengths
+        self.lengths = array("I", bytes(4 * size))
+        self.live = bytearray(size)
+        self.df = Counter()
+        self.passages = 0
+        self.total_length = 0
+
+        for segment in segments:
+            self.lengths[segment.first:segment.end] = array("I", segment.lengths)
+        for path in self.corpus.paths():
+            chunk_ids = self.corpus.chunk_ids(path)
+            live = range(chunk_ids.start, min(chunk_ids.stop, self.base_end))
+            if not live:
+                continue
+            self.live[live.start:live.stop] = b"\x01" * len(live)
+            self.passages += len(live)
+            self.total_length += sum(self.lengths[live.start:live.stop])
+            if chunk_ids.stop <= self.base_end:
+                self.indexed[path] = chunk_ids
+        # Segment term counts include the chunks superseded since.
+        for segment in segments:
+            for chunk_id in range(segment.first, segment.end):
+                if not self.live[chunk_id]:
+                    self.df.subtract(segment.terms_of(chunk_id))
+
+        # Live chunks past the segments stay in memory, with their postings.
+        self._terms = {c: terms for c, terms in self._terms.items() if c >= self.base_end}
+        postings, self.postings = self.postings, {}
+        if not self._terms:
+            return
+        keep = bytearray(len(tail_lengths))
+        for chunk_id, terms in self._terms.items():
+            keep[chunk_id] = 1
+            length = self.lengths[chunk_id] = tail_lengths[chunk_id]
+            self.live[chunk_id] = 1
+            self.passages += 1
+            self.total_length += length
+            self.df.update(terms)
+        for term, (chunk_ids, tfs) in postings.items():
+            mask = bytes(map(keep.__getitem__, chunk_ids))
+            if any(mask):
+                self.postings[term] = (array("I", compress(chunk_ids, mask)), array("H", compress(tfs, mask)))
+
+    def _flush(self):
+        """
+        Writes the chunks indexed in memory past the last segment as a new
+        segment once `flush_chunks` consecutive ones are ready, then merges
+        trailing segments while the older is no wider than the newer.
+        Caller holds the lock.
+        """
+        with self.corpus.locked():
+            self._refresh_segments()
+            first = end = self.base_end
+            count = self.corpus.chunk_count()
+            # Superseded chunks need not be indexed; a current one not yet
+            # indexed here ends the range.
+            while end < count and (end in self._terms or not self._current(end)):
+                end += 1
+            if end - first < self.flush_chunks:
+                return
+
+            path = os.path.join(self.root, segment_name(first, end))
+            PassageSegment.write(path, first, end, self.postings, self._terms, self.lengths)
+            segments = self.segments + [PassageSegment(path)]
+            while len(segments) >= 2 and segments[-2].width <= segments[-1].width:
+                older, newer = segments[-2:]
+                path = os.path.join(self.root, segment_name(older.first, newer.end))
+                PassageSegment.merge(path, [older, newer])
+                segments[-2:] = [PassageSegment(path)]
+            self._load(segments)
+            self._remove_stale()
+
+    def _remove_stale(self):
+        """
+        Deletes segment files no longer in the chain, and temp files of
+        interrupted writes. Caller holds the corpus lock, so no write is in
+        progress; mapped files stay readable to processes using them.
+        """
+        keep = {os.path.basename(segment.path) for segment in self.segments}
+        for name in os.listdir(self.root):
+            if (SEGMENT_RE.match(name) and name not in keep) or name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(self.root, name))
+                except OSError:
+                    pass  # e.g. still mapped on Windows; retried on the next flush
+
+    def sync(self):
+        """
+        Loads the persisted segments, then indexes every corpus document
+        not yet indexed at its current version, including documents other
+        processes added to the corpus. Holds the lock one document at a
+        time, so searches keep running (over what is indexed so far) while
+        a large corpus builds.
+
+        Returns:
+            int: Documents indexed.
+        """
+        self.corpus.refresh()
+        with self._lock:
+            self._refresh_segments()
+        count = 0
+        for path in self.corpus.paths():
+            with self._lock:
+                if self.indexed.get(path) != self.corpus.chunk_ids(path):
+                    self.add_document(path)
+                    count += 1
+        return count
+
+    def __len__(self):
+        return self.passages
+
+    # ----------------------------------------------------------------
+    # Search
+    # ----------------------------------------------------------------
+
+    def search(self, query, k=5):
+        """
+        Returns the top-k passages for a query by BM25 score.
+
+        Args:
+            query (str): Free-text query.
+            k (int): Maximum passages returned.
+
+        Returns:
+            list: Dicts with path, chunk id, score and a text excerpt, best first.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            n = self.passages
+            if not n or not terms or k <= 0:
+                return []
+            avg_length = self.total_length / n
+
+            weighted = []
+            for term in terms:
+                found = [p for p in (segment.lookup(term) for segment in self.segments) if p is not None]
+                df = sum(len(chunk_ids) for chunk_ids, _ in found) + self.df.get(term, 0)
+                if term in self.postings:
+                    found.append(self.postings[term])
+                if df > 0:
+                    idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                    weighted.append((df, idf, found))
+            if not weighted:
+                return []
+            weighted.sort(key=lambda item: item[0])
+            rare = [w for w in weighted if w[0] <= self.max_df_ratio * n]
+            weighted = rare or weighted[:1]
+
+            k1, b = self.k1, self.b
+            lengths, live = self.lengths, self.live
+            scores = {}
+            for _, idf, found in weighted:
+                for chunk_ids, freqs in found:
+                    for chunk_id, tf in zip(chunk_ids, freqs):
+                        if not live[chunk_id]:
+                            continue
+                        norm = k1 * (1 - b + b * lengths[chunk_id] / avg_length)
+                        scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+        results = []
+        for chunk_id, score in top:
+            doc_id = self.corpus.chunk_info(chunk_id)[0]
+            results.append({
+                "path": self.corpus.doc_paths[doc_id],
+                "chunk": chunk_id,
+                "score": round(score, 4),
+                "excerpt": self.excerpt(chunk_id, terms),
+            })
+        return results
+
+    def excerpt(self, chunk_id, terms, width=EXCERPT_CHARS):
+        """
+        Returns about `width` characters of a passage around the first
+        query term it contains.
+        """
+        text = self.corpus.chunk_text(chunk_id)
+        lowered = text.lower()
+        hits = [i for i in (lowered.find(term) for term in terms) if i >= 0]
+        start = max(0, min(hits, default=0) - width // 4)
+        snippet = " ".join(text[start:start + width].split())
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if start + width < len(text) else ""
+        return f"{prefix}{snippet}{suffix}"
@@ -1,28 +1,31 @@
-from pdf2image import convert_from_path
-from PIL import Image
-import pytesseract
+import logging
 
-def extract_text_from_pdf(pdf_path, dpi=200, verbose=True):
+from .kernel_modules.ocr_engine import SullyOCREngine
+
+logger = logging.getLogger(__name__)
+
+def extract_text_from_pdf(pdf_path, dpi=200, verbose=True, workers=None):
     """
     Extracts OCR'd text from all pages of a PDF file.
     
     Args:
         pdf_path (str): Full path to the PDF file.
         dpi (int): DPI used to render PDF pages as images.
-        verbose (bool): Whether to print per-page progress.
+        verbose (bool): Whether to log per-page progress (at INFO level).
+        workers (int or None): Parallel OCR processes (defaults to CPU count).
 
     Returns:
         str: Concatenated OCR text from all pages.
     """
     try:
-        images = convert_from_path(pdf_path, dpi=dpi)
+        engine = SullyOCREngine(workers=workers)
         full_text = []
 
-        for i, img in enumerate(images):
-            text = pytesseract.image_to_string(img)
+        for page in engine.iter_ocr_pages(pdf_path, dpi=dpi):
+            n, text = page["page"], page["text"]
             if verbose:
-                print(f"[OCR] Page {i+1}: {len(text)} characters")
-            full_text.append(f"\n\n--- Page {i+1} ---\n{text.strip()}")
+                logger.info("OCR page %d: %d characters (%.2fs)", n, len(text), page["seconds"])
+            full_text.append(f"\n\n--- Page {n} ---\n{text.strip()}")
 
         return "\n".join(full_text).strip()
 
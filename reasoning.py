@@ -1,15 +1,31 @@
 # sully_engine/reasoning.py
 # 🧠 Sully's Symbolic Reasoning Node
 
+from .metrics import REGISTRY
+
+REASON_STAGES = REGISTRY.histogram(
+    "sully_reason_stage_seconds", "Time spent in each stage of symbolic reasoning.", ("stage",)
+)
+
 class SymbolicReasoningNode:
     """
     Core reasoning node that synthesizes meaning from symbolic input.
-    Combines memory, codex search, and math translation for insight.
+    Combines memory, codex search, passage retrieval from ingested books,
+    and math translation for insight.
     """
-    def __init__(self, codex, translator, memory):
+    def __init__(self, codex, translator, memory, passages=None, codex_limit=10, passage_limit=3):
+        """
+        Args:
+            passages (PassageIndex or None): Ranked index over ingested text.
+            codex_limit (int): Most codex echoes included per response.
+            passage_limit (int): Most book passages included per response.
+        """
         self.codex = codex
         self.translator = translator
         self.memory = memory
+        self.passages = passages
+        self.codex_limit = codex_limit
+        self.passage_limit = passage_limit
 
     def reason(self, phrase, tone="emergent"):
         """
@@ -22,23 +38,86 @@ class SymbolicReasoningNode:
         Returns:
             dict: Symbolic reflection, math hint, memory context, and decision.
         """
+        watch = REGISTRY.stopwatch(REASON_STAGES)
+
         # Step 1: Reframe the phrase (symbolic insight)
         reframed = f"'{phrase}' reflects a symbolic shift in perception."
 
         # Step 2: Math translation (if applicable)
         math_hint = self.translator.translate(phrase)
-        math_hint = math_hint if math_hint else "∅"
+        watch.lap("translate")
 
-        # Step 3: Codex memory lookup
-        related = self.codex.search(phrase)
-        memory_links = [
-            f"Echo from {k}: {v.get('reframed', '...')}" for k, v in related.items()
-        ] if related else ["No echoes found."]
+        # Step 3: Codex memory lookup and book passages
+        related = self.codex.search(phrase, limit=self.codex_limit)
+        watch.lap("codex_search")
+        passages = self._passages(phrase)
+        watch.lap("passage_search")
 
         # Step 4: Add to memory
         self.memory.store_query(phrase, {"reframed": reframed})
+        watch.lap("memory_append")
 
         # Step 5: Symbolic response
+        response = self._respond(phrase, tone, reframed, math_hint, related, passages)
+        watch.lap("respond")
+        return response
+
+    def reason_batch(self, phrases, tone="emergent"):
+        """
+        Reasons over many phrases at once. Each distinct phrase is translated
+        and looked up in the codex once, and all queries are stored in memory
+        with a single bulk append.
+
+        Args:
+            phrases (list): Input messages, in order.
+            tone (str): Cognitive mood applied to every message.
+
+        Returns:
+            list: One result per phrase, identical to calling reason() in turn.
+        """
+        watch = REGISTRY.stopwatch(REASON_STAGES)
+        distinct = dict.fromkeys(phrases)
+        math_hints = {phrase: self.translator.translate(phrase) for phrase in distinct}
+        watch.lap("batch_translate")
+        related = {phrase: self.codex.search(phrase, limit=self.codex_limit) for phrase in distinct}
+        watch.lap("batch_codex_search")
+        passages = {phrase: self._passages(phrase) for phrase in distinct}
+        watch.lap("batch_passage_search")
+
+        reframed = [f"'{phrase}' reflects a symbolic shift in perception." for phrase in phrases]
+        self.memory.store_queries([
+            (phrase, {"reframed": r}) for phrase, r in zip(phrases, reframed)
+        ])
+        watch.lap("batch_memory_append")
+
+        responses = [
+            self._respond(phrase, tone, r, math_hints[phrase], related[phrase], passages[phrase])
+            for phrase, r in zip(phrases, reframed)
+        ]
+        watch.lap("batch_respond")
+        return responses
+
+    def _passages(self, phrase):
+        """
+        Returns the top-ranked ingested passages for a phrase.
+        """
+        if self.passages is None:
+            return []
+        return self.passages.search(phrase, k=self.passage_limit)
+
+    def _respond(self, phrase, tone, reframed, math_hint, related, passages=()):
+        """
+        Assembles the layered response for one phrase.
+        """
+        math_hint = math_hint if math_hint else "∅"
+        memory_links = [
+            f"Echo from {k}: {v.get('reframed', '...')}" for k, v in related.items()
+        ] + [
+            f"Passage from {p['path']}: {p['excerpt']}" for p in passages
+        ]
+        if not memory_links:
+            memory_links = ["No echoes found."]
+
         return {
             "reframed": reframed,
             "math_hint": math_hint,
@@ -47,13 +126,21 @@ class SymbolicReasoningNode:
             "decision": f"The symbol '{phrase}' resonates as transformation."
         }
 
-    def analyze(self, phrase):
+    def analyze(self, phrase, cursor=0, limit=100):
         """
         Returns a deep-dive symbolic diagnostic (internal inspection mode).
+
+        Args:
+            phrase (str): Input message or symbolic statement.
+            cursor (int): Memory position to start the memory page from.
+            limit (int): Max codex matches and memory entries included.
+
+        Returns:
+            dict: Codex matches, one page of memory, and the math translation.
         """
         return {
             "raw_input": phrase,
-            "codex_matches": self.codex.search(phrase),
-            "memory_status": self.memory.export_memory(),
+            "codex_matches": self.codex.search(phrase, limit=limit),
+            "memory_status": self.memory.page(cursor, limit),
             "math_translation": self.translator.translate(phrase)
         }
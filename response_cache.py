@@ -0,0 +1,107 @@
+# sully_engine/kernel_modules/response_cache.py
+# 🧊 Sully's Response Cache — Bounded LRU/TTL memo for repeated requests
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def etag(body):
+    """
+    Returns a strong ETag for a response body (bytes).
+    """
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, tag):
+    """
+    Checks an If-None-Match header value against an ETag.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == tag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live.
+
+    Callers make stale entries unreachable by putting the revision of the
+    data they depend on into the key, so a change is never served from the
+    cache; superseded entries simply age out.
+    """
+
+    def __init__(self, max_entries=1024, ttl=None):
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used
+                is evicted (0 disables caching).
+            ttl (float or None): Seconds an entry stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns the cached value, or None on a miss or expiry.
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting the least recently used entry when full.
+        """
+        if self.max_entries <= 0:
+            return
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, fn):
+        """
+        Returns the cached value for a key, computing and storing it on a miss.
+        """
+        value = self.get(key)
+        if value is None:
+            value = fn()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns size and hit/miss counters.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,430 @@
+# sully_engine/snapshot.py
+# 💾 Sully's Snapshots — Compact binary save and memory-mapped warm start
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict, defaultdict
+from collections.abc import MutableMapping
+
+from .ngram_index import trigrams
+
+MAGIC = b"SULLYSN1"
+ALIGN = 8
+
+
+# ----------------------------------------------------------------
+# Record sections: a u64 offset table plus the concatenated payloads
+# ----------------------------------------------------------------
+
+def pack_records(payloads):
+    """
+    Packs byte strings into (offsets, data) sections; record i is
+    data[offsets[i]:offsets[i + 1]].
+    """
+    payloads = list(payloads)
+    offsets = array("Q", [0])
+    total = 0
+    for payload in payloads:
+        total += len(payload)
+        offsets.append(total)
+    return offsets.tobytes(), b"".join(payloads)
+
+
+def encode_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(buf):
+    return json.loads(str(buf, "utf-8"))
+
+
+def decode_text(buf):
+    return str(buf, "utf-8")
+
+
+class MappedRecords:
+    """
+    Read-only sequence over a record section of a mapped snapshot.
+    Records are decoded on access, so opening costs nothing per record.
+    """
+
+    def __init__(self, offsets, data, decode):
+        self._offsets = offsets
+        self._data = data
+        self._decode = decode
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("record index out of range")
+        return self._decode(self._data[self._offsets[i]:self._offsets[i + 1]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class RecordList:
+    """
+    List-like store whose leading items come from a snapshot (decoded on
+    access) and whose later items are appended in memory.
+    """
+
+    def __init__(self, base=()):
+        self.base = base
+        self.tail = []
+
+    def __len__(self):
+        return len(self.base) + len(self.tail)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self.base)
+        if i < 0:
+            i += len(self)
+        if 0 <= i < n:
+            return self.base[i]
+        return self.tail[i - n]
+
+    def __iter__(self):
+        yield from self.base
+        yield from self.tail
+
+    def append(self, item):
+        self.tail.append(item)
+
+    def extend(self, items):
+        self.tail.extend(items)
+
+
+class RecordMap(MutableMapping):
+    """
+    Dict-like store whose initial values come from a snapshot. Keys are
+    held in memory (in their saved order); a value is decoded on first
+    access and kept. Writes and new keys stay in memory, after the saved
+    keys.
+    """
+
+    def __init__(self, keys, values):
+        self._positions = {key: i for i, key in enumerate(keys)}
+        self._values = values
+        self._loaded = {}  # key -> value decoded or written since
+
+    def __getitem__(self, key):
+        value = self._loaded.get(key, self)
+        if value is not self:
+            return value
+        value = self._loaded[key] = self._values[self._positions[key]]
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._positions:
+            self._positions[key] = len(self._positions)
+        self._loaded[key] = value
+
+    def __delitem__(self, key):
+        del self._positions[key]
+        self._loaded.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+
+# ----------------------------------------------------------------
+# Trigram postings: sorted gram keys, (start, count) spans, u32 keys
+# ----------------------------------------------------------------
+
+def _gram_key(gram):
+    return struct.pack(">3I", *map(ord, gram))
+
+
+def pack_postings(texts):
+    """
+    Builds trigram postings over texts (keys are their positions).
+
+    Returns:
+        tuple: (gram_keys, spans, postings) section bytes.
+    """
+    grams = defaultdict(list)
+    for i, text in enumerate(texts):
+        for gram in trigrams(text):
+            grams[gram].append(i)
+
+    keys, spans, postings = [], array("Q"), array("I")
+    for key, gram in sorted((_gram_key(g), g) for g in grams):
+        keys.append(key)
+        spans.extend((len(postings), len(grams[gram])))
+        postings.extend(grams[gram])
+    return b"".join(keys), spans.tobytes(), postings.tobytes()
+
+
+class MappedPostings:
+    """
+    Read-only trigram postings from a mapped snapshot, usable as the
+    `base` of a TrigramIndex. Grams are found by binary search, so
+    nothing is loaded up front; decoded postings of recently used grams
+    are kept (up to `cache_keys` keys in total) so hot searches don't
+    re-decode them. The gram vocabulary is decoded once, on the first
+    short-needle search.
+    """
+
+    def __init__(self, keys, spans, postings, cache_keys=4_000_000):
+        self._keys = keys
+        self._spans = spans
+        self._postings = postings
+        self._count = len(keys) // 12
+        self.cache_keys = cache_keys
+        self._cache = OrderedDict()  # gram -> set
+        self._cached = 0
+        self._grams = None  # gram strings in key order, once decoded
+        self._lock = threading.Lock()
+
+    def get(self, gram):
+        """
+        Returns the set of keys containing the gram, or None.
+        """
+        with self._lock:
+            keys = self._cache.get(gram)
+            if keys is not None:
+                self._cache.move_to_end(gram)
+                return keys
+
+        keys = self._lookup(gram)
+        if keys is not None and len(keys) <= self.cache_keys:
+            with self._lock:
+                if gram not in self._cache:
+                    self._cache[gram] = keys
+                    self._cached += len(keys)
+                while self._cached > self.cache_keys:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cached -= len(evicted)
+        return keys
+
+    def _lookup(self, gram):
+        target = _gram_key(gram)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = bytes(self._keys[mid * 12:mid * 12 + 12])
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                start, count = self._spans[2 * mid], self._spans[2 * mid + 1]
+                return set(self._postings[start:start + count])
+        return None
+
+    def grams(self):
+        """
+        Returns every gram, in key order.
+        """
+        if self._grams is None:
+            grams = [
+                "".join(map(chr, codes)) for codes in struct.iter_unpack(">3I", self._keys)
+            ]
+            with self._lock:
+                if self._grams is None:
+                    self._grams = grams
+        return self._grams
+
+    def containing(self, needle):
+        """
+        Yields the postings (read-only sequences of keys) of every gram
+        containing the needle, decoding only those.
+        """
+        spans = self._spans
+        for i, gram in enumerate(self.grams()):
+            if needle in gram:
+                start = spans[2 * i]
+                yield self._postings[start:start + spans[2 * i + 1]]
+
+    def items(self):
+        """
+        Yields (gram, keys) for every gram.
+        """
+        spans = self._spans
+        for i, gram in enumerate(self.grams()):
+            start = spans[2 * i]
+            yield gram, set(self._postings[start:start + spans[2 * i + 1]])
+
+
+# ----------------------------------------------------------------
+# File container
+# ----------------------------------------------------------------
+
+def write_sections(path, sections):
+    """
+    Writes named byte sections atomically as one snapshot file.
+
+    Layout: MAGIC, u32 header length, JSON header mapping each section
+    name to [offset, length], then the sections, each 8-byte aligned so
+    they can be cast to typed arrays in place.
+    """
+    def pad(n):
+        return -n % ALIGN
+
+    layout = {}
+    header = b""
+    # The header size depends on the offsets it records; iterate until stable.
+    for _ in range(5):
+        offset = len(MAGIC) + 4 + len(header)
+        offset += pad(offset)
+        layout = {}
+        for name, data in sections.items():
+            layout[name] = [offset, len(data)]
+            offset += len(data) + pad(len(data))
+        encoded = encode_json({"version": 1, "sections": layout})
+        if len(encoded) == len(header):
+            break
+        header = encoded
+
+    # A unique temp file per writer: several workers may save at once, and
+    # each publishes a complete file (the last replace wins).
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with open(fd, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            f.write(b"\0" * pad(f.tell()))
+            for name, data in sections.items():
+                assert f.tell() == layout[name][0]
+                f.write(data)
+                f.write(b"\0" * pad(len(data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class Snapshot:
+    """
+    A snapshot file mapped read-only into memory. Sections are exposed as
+    zero-copy memoryviews; the mapping stays alive while any view of it
+    is referenced, even if the file is replaced by a newer snapshot.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            # mmap cannot map an empty file; anything shorter than the
+            # preamble is not a snapshot either.
+            if os.fstat(f.fileno()).st_size < len(MAGIC) + 4:
+                raise ValueError(f"{path} is empty or truncated, not a Sully snapshot")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a Sully snapshot")
+        (header_len,) = struct.unpack("<I", view[len(MAGIC):len(MAGIC) + 4])
+        start = len(MAGIC) + 4
+        self.sections = json.loads(bytes(view[start:start + header_len]))["sections"]
+        self._view = view
+
+    def __contains__(self, name):
+        return name in self.sections
+
+    def section(self, name, fmt=None):
+        offset, length = self.sections[name]
+        view = self._view[offset:offset + length]
+        return view.cast(fmt) if fmt else view
+
+    def json(self, name):
+        return decode_json(self.section(name))
+
+    def records(self, name, decode):
+        return MappedRecords(self.section(f"{name}.offsets", "Q"), self.section(f"{name}.data"), decode)
+
+    def postings(self, name):
+        return MappedPostings(
+            self.section(f"{name}.gram_keys"), self.section(f"{name}.spans", "Q"),
+            self.section(f"{name}.postings", "I")
+        )
+
+
+# ----------------------------------------------------------------
+# Whole-Sully save / restore
+# ----------------------------------------------------------------
+
+def save_snapshot(sully, path):
+    """
+    Writes the codex and search memory (each with its trigram index),
+    paradoxes, math mappings, judgment history and statistics, and
+    knowledge.
+
+    Returns:
+        dict: Section names and sizes in bytes.
+    """
+    codex = sully.codex.export()
+    memory = sully.memory.export_memory()
+    knowledge = list(sully.knowledge)
+
+    sections = {}
+    sections["state"] = encode_json({
+        "paradoxes": sully.paradox.export(),
+        "math_mappings": sully.translator.export_mappings(),
+        "judgment": sully.judgment.export_state(),
+    })
+    # Codex entries in insertion order; postings are keyed by position.
+    sections["codex.topics"] = encode_json(list(codex))
+    sections["codex.offsets"], sections["codex.data"] = pack_records(encode_json(e) for e in codex.values())
+    (sections["codex.gram_keys"], sections["codex.spans"],
+     sections["codex.postings"]) = pack_postings(sully.codex.index_text(t, e) for t, e in codex.items())
+    sections["memory.offsets"], sections["memory.data"] = pack_records(encode_json(e) for e in memory)
+    sections["memory.queries.offsets"], sections["memory.queries.data"] = pack_records(
+        e["query"].encode("utf-8") for e in memory
+    )
+    (sections["memory.gram_keys"], sections["memory.spans"],
+     sections["memory.postings"]) = pack_postings(e["query"].lower() for e in memory)
+    sections["knowledge.offsets"], sections["knowledge.data"] = pack_records(
+        text.encode("utf-8") for text in knowledge
+    )
+
+    write_sections(path, sections)
+    return {name: len(data) for name, data in sections.items()}
+
+
+def load_snapshot(sully, path):
+    """
+    Restores a snapshot written by save_snapshot(). Codex and memory
+    entries, their indexes and knowledge stay in the mapped file and are
+    decoded on access. Codex, memory, paradoxes and mappings are skipped
+    when Sully uses a shared storage backend, which already holds them.
+    """
+    snapshot = Snapshot(path)
+    state = snapshot.json("state")
+
+    if sully.backend is None:
+        if "codex.topics" in snapshot:
+            codex = RecordMap(snapshot.json("codex.topics"), snapshot.records("codex", decode_json))
+            sully.codex.restore(codex, snapshot.postings("codex"))
+        else:  # written before the codex had its own sections
+            sully.codex.restore(state["codex"])
+        sully.paradox.restore(state["paradoxes"])
+        sully.translator.restore(state["math_mappings"])
+        queries = None
+        if "memory.queries.offsets" in snapshot:
+            queries = RecordList(snapshot.records("memory.queries", decode_text))
+        sully.memory.restore(
+            RecordList(snapshot.records("memory", decode_json)), snapshot.postings("memory"), queries
+        )
+    sully.judgment.restore_state(state["judgment"])
+    sully.restore_knowledge(RecordList(snapshot.records("knowledge", decode_text)))
+    return snapshot
@@ -0,0 +1,194 @@
+# sully_engine/storage.py
+# 🗄️ Sully's Shared State — Storage backends for codex, memory, paradoxes and mappings
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+
+class StorageBackend(ABC):
+    """
+    Interface for state shared between Sully processes.
+
+    State is grouped into named collections of key -> JSON value. Every
+    write gets a new, increasing sequence number, so a process keeps its
+    in-memory copy current by asking only for rows written since the last
+    sequence it saw. Clearing a collection bumps its epoch, which tells
+    readers to drop their copy and reload.
+
+    Backends implement every abstract method; an incomplete one fails when
+    it is constructed.
+    """
+
+    @abstractmethod
+    def put(self, collection, key, value, overwrite=True):
+        """
+        Stores a value under a key. With overwrite=False an existing key
+        is left untouched (used to seed defaults).
+        """
+
+    @abstractmethod
+    def append(self, collection, value):
+        """
+        Stores a value under a fresh key, after everything already written.
+        """
+
+    @abstractmethod
+    def extend(self, collection, values):
+        """
+        Appends several values, in order, in one write.
+        """
+
+    @abstractmethod
+    def clear(self, collection):
+        """
+        Removes every entry of a collection and starts a new epoch.
+        """
+
+    @abstractmethod
+    def changes(self, collection, epoch, since):
+        """
+        Returns rows written after sequence `since`.
+
+        Args:
+            collection (str): Collection name.
+            epoch (int): Epoch the caller's copy belongs to.
+            since (int): Highest sequence the caller has applied.
+
+        Returns:
+            tuple: (epoch, version, rows). If `epoch` differs from the one
+            passed in, the caller's copy is stale and `rows` holds the whole
+            collection. Rows are (key, value) pairs in first-write order.
+        """
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Storage backend on a local SQLite database in WAL mode, so any number
+    of worker processes on one host can read concurrently while writes
+    are serialized by SQLite.
+    """
+
+    def __init__(self, path="sully_state.db", timeout=30.0):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._seen_version = {}  # collection -> PRAGMA data_version at last read
+        self._dirty = set()  # collections this connection wrote since last read
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    collection TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    PRIMARY KEY (collection, key)
+                );
+                CREATE INDEX IF NOT EXISTS entries_seq ON entries (collection, seq);
+                CREATE TABLE IF NOT EXISTS epochs (
+                    collection TEXT PRIMARY KEY,
+                    epoch INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS counter (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    seq INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO counter VALUES (0, 0);
+            """)
+
+    # ----------------------------------------------------------------
+    # Writes
+    # ----------------------------------------------------------------
+
+    def _write(self, collection, fn, count=1):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("UPDATE counter SET seq = seq + ?", (count,))
+                seq = self._conn.execute("SELECT seq FROM counter").fetchone()[0]
+                fn(seq)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._dirty.add(collection)
+            return seq
+
+    def put(self, collection, key, value, overwrite=True):
+        data = json.dumps(value, ensure_ascii=False)
+        if overwrite:
+            sql = ("INSERT INTO entries VALUES (?, ?, ?, ?, ?) ON CONFLICT (collection, key) "
+                   "DO UPDATE SET value = excluded.value, seq = excluded.seq")
+        else:
+            sql = "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?)"
+        self._write(collection, lambda seq: self._conn.execute(sql, (collection, key, data, seq, seq)))
+
+    def append(self, collection, value):
+        data = json.dumps(value, ensure_ascii=False)
+        self._write(collection, lambda seq: self._conn.execute(
+            "INSERT INTO entries VALUES (?, ?, ?, ?, ?)", (collection, str(seq), data, seq, seq)
+        ))
+
+    def extend(self, collection, values):
+        rows = [json.dumps(value, ensure_ascii=False) for value in values]
+        if not rows:
+            return
+
+        def insert_rows(last):
+            first = last - len(rows) + 1
+            self._conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?)", [
+                (collection, str(first + i), data, first + i, first + i) for i, data in enumerate(rows)
+            ])
+        self._write(collection, insert_rows, count=len(rows))
+
+    def clear(self, collection):
+        def clear_rows(seq):
+            self._conn.execute("DELETE FROM entries WHERE collection = ?", (collection,))
+            self._conn.execute(
+                "INSERT INTO epochs VALUES (?, 1) ON CONFLICT (collection) DO UPDATE SET epoch = epoch + 1",
+                (collection,)
+            )
+        self._write(collection, clear_rows)
+
+    # ----------------------------------------------------------------
+    # Reads
+    # ----------------------------------------------------------------
+
+    def changes(self, collection, epoch, since):
+        with self._lock:
+            # data_version only moves when another connection commits, so an
+            # unchanged value (and no local write) means nothing new to read.
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._seen_version.get(collection) == data_version and collection not in self._dirty:
+                return epoch, since, []
+
+            self._conn.execute("BEGIN")
+            try:
+                row = self._conn.execute("SELECT epoch FROM epochs WHERE collection = ?", (collection,)).fetchone()
+                current = row[0] if row else 0
+                if current != epoch:
+                    since = 0
+                rows = self._conn.execute(
+                    "SELECT key, value, seq FROM entries WHERE collection = ? AND seq > ? ORDER BY rank",
+                    (collection, since)
+                ).fetchall()
+            finally:
+                self._conn.execute("COMMIT")
+
+            self._seen_version[collection] = data_version
+            self._dirty.discard(collection)
+
+        version = max((seq for _, _, seq in rows), default=since)
+        return current, version, [(key, json.loads(value)) for key, value, _ in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,14 @@
 # --- Imports ---
-import os
 import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from sully_engine.identity import SullyIdentity
 from sully_engine.codex import SullyCodex
 from sully_engine.reasoning import SymbolicReasoningNode
 from sully_engine.memory import SullySearchMemory
+from sully_engine.passage_index import PassageIndex
+from sully_engine.snapshot import save_snapshot, load_snapshot
 
 # Kernel Modules
 from sully_engine.kernel_modules.judgment import JudgmentProtocol
@@ -13,31 +17,82 @@ from sully_engine.kernel_modules.math_translator import SymbolicMathTranslator
 from sully_engine.kernel_modules.fusion import SymbolFusionEngine
 from sully_engine.kernel_modules.paradox import ParadoxLibrary
 from sully_engine.kernel_modules.ocr_engine import SullyOCREngine
-from sully_engine.kernel_modules.ingest_books import BookIngestor
-
-MEMORY_PATH = "sully_ingested.json"
+from sully_engine.kernel_modules.ingest_books import (
+    BookIngestor, SUPPORTED_EXTENSIONS, IngestionError, ingest_file
+)
+from sully_engine.kernel_modules.book_manifest import BookManifest
+from sully_engine.kernel_modules.ingest_store import IngestStore
+from sully_engine.kernel_modules.corpus_store import CorpusStore
+from sully_engine.kernel_modules.extraction_cache import ExtractionCache
+
+MEMORY_PATH = "sully_ingested.json"  # legacy whole-file dump, imported once
+INGEST_LOG_PATH = "sully_ingested.log"  # legacy ingestion log, imported once
+CORPUS_DIR = "sully_corpus"
+EXTRACTION_CACHE_DIR = "sully_cache"
+BOOK_MANIFEST_PATH = "sully_books_manifest.json"
+SNAPSHOT_PATH = "sully_state.snapshot"
 
 
 class Sully:
-    def __init__(self):
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend (StorageBackend or None): Shared store for codex, memory,
+                paradoxes and math mappings, so several worker processes see
+                the same state. None keeps that state in this process only.
+        """
+        self.backend = backend
         self.identity = SullyIdentity()
-        self.memory = SullySearchMemory()
-        self.codex = SullyCodex()
+        self.memory = SullySearchMemory(backend)
+        self.codex = SullyCodex(backend)
 
-        self.translator = SymbolicMathTranslator()
+        self.translator = SymbolicMathTranslator(backend)
         self.judgment = JudgmentProtocol()
-        self.dream = DreamCore()
-        self.paradox = ParadoxLibrary()
+        self.dream_core = DreamCore()
+        self.paradox = ParadoxLibrary(backend)
         self.fusion = SymbolFusionEngine()
+
+        # Ingested book text lives only in the on-disk corpus and is read
+        # back through memory-mapped chunks, never held in `knowledge`.
+        self.corpus = CorpusStore(CORPUS_DIR)
+        if not len(self.corpus):
+            self._import_legacy_corpus()
+        self.passages = PassageIndex(self.corpus)
+
         self.reasoning_node = SymbolicReasoningNode(
             codex=self.codex,
             translator=self.translator,
-            memory=self.memory
+            memory=self.memory,
+            passages=self.passages
         )
 
-        self.ocr = SullyOCREngine()
-        self.book_ingestor = BookIngestor(ocr_enabled=True)
+        # OCR and book ingestion are built on first use (see the properties
+        # below), so chat-only workers never load the imaging stack.
+        self.extraction_cache = ExtractionCache(EXTRACTION_CACHE_DIR)
+        self._ocr = None
+        self._book_ingestor = None
+        self._lazy_lock = threading.Lock()
         self.knowledge = []
+        self._knowledge_lock = threading.Lock()
+
+        # Index books already in the corpus in the background; chat is served
+        # meanwhile, drawing on whatever has been indexed so far.
+        if len(self.corpus):
+            threading.Thread(target=self.passages.sync, daemon=True).start()
+
+    @property
+    def ocr(self):
+        with self._lazy_lock:
+            if self._ocr is None:
+                self._ocr = SullyOCREngine(cache=self.extraction_cache)
+            return self._ocr
+
+    @property
+    def book_ingestor(self):
+        with self._lazy_lock:
+            if self._book_ingestor is None:
+                self._book_ingestor = BookIngestor(ocr_enabled=True, cache=self.extraction_cache)
+            return self._book_ingestor
 
     def speak_identity(self):
         return self.identity.speak_identity()
@@ -45,8 +100,17 @@ class Sully:
     def evaluate_claim(self, text):
         return self.judgment.evaluate(text)
 
-    def dream(self, seed):
-        return self.dream.generate(seed)
+    def evaluate_claims(self, texts):
+        return self.judgment.evaluate_batch(texts)
+
+    def judgment_stats(self):
+        return self.judgment.statistics()
+
+    def dream(self, seed, variant=0):
+        return self.dream_core.generate(seed, variant)
+
+    def dreamscape(self, seed, depth=2, budget=12, variant=0):
+        return self.dream_core.dreamscape(seed, depth, budget, variant=variant)
 
     def translate_math(self, phrase):
         return self.translator.translate(phrase)
@@ -60,37 +124,99 @@ class Sully:
     def reason(self, message, tone="emergent"):
         return self.reasoning_node.reason(message, tone)
 
+    def reason_batch(self, messages, tone="emergent"):
+        return self.reasoning_node.reason_batch(messages, tone)
+
+    def analyze(self, message, cursor=0, limit=100):
+        return self.reasoning_node.analyze(message, cursor, limit)
+
     def remember(self, message):
-        self.knowledge.append(message)
+        with self._knowledge_lock:
+            self.knowledge.append(message)
         return f"📘 Stored: '{message}'"
 
-    def ingest_and_store_text(self, file_path):
-        content = self.book_ingestor.ingest(file_path)
+    def restore_knowledge(self, items):
+        with self._knowledge_lock:
+            self.knowledge = items
+
+    def save_snapshot(self, path=SNAPSHOT_PATH):
+        """
+        Saves codex, memory, paradoxes, mappings, judgment state and
+        knowledge to one binary snapshot file.
+        """
+        return save_snapshot(self, path)
+
+    def load_snapshot(self, path=SNAPSHOT_PATH):
+        """
+        Warm-starts from a snapshot; large sections stay memory-mapped.
+        """
+        load_snapshot(self, path)
+        return f"[Snapshot restored: {path}]"
+
+    def ingest_and_store_text(self, file_path, progress=None, key=None):
+        """
+        Ingests one file into the corpus, under `key` (default: its path),
+        replacing any earlier version stored under the same key.
+
+        Raises:
+            IngestionError: If extraction fails or yields no text.
+        """
+        content = self.book_ingestor.ingest(file_path, progress=progress)
+        if not content:
+            raise IngestionError("No content extracted")
+        return self._store_ingested(key or file_path, content)
+
+    def _store_ingested(self, file_path, content):
         if content:
-            self.knowledge.append(content)
             self.save_to_disk(file_path, content)
             return f"[Book Ingested: {file_path}]"
         return "[No Content Extracted]"
 
     def save_to_disk(self, path, content):
-        data = {path: content}
-        if os.path.exists(MEMORY_PATH):
+        self.corpus.add(path, content)
+        self.passages.add_document(path)
+
+    def _import_legacy_corpus(self):
+        """
+        Moves text from the older ingestion log (or the JSON dump before it)
+        into the corpus store, one document at a time.
+        """
+        if os.path.exists(INGEST_LOG_PATH):
+            legacy = IngestStore(INGEST_LOG_PATH, auto_compact=False)
+            self.corpus.import_items(legacy.items(), if_empty=True)
+            legacy.close()
+        elif os.path.exists(MEMORY_PATH):
             with open(MEMORY_PATH, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-            existing.update(data)
-        else:
-            existing = data
-        with open(MEMORY_PATH, "w", encoding="utf-8") as f:
-            json.dump(existing, f, indent=2)
-
-    def load_books_from_folder(self, folder_path="sullybooks"):
+                self.corpus.import_items(json.load(f).items(), if_empty=True)
+
+    def load_books_from_folder(self, folder_path="sullybooks", workers=None):
+        """
+        Ingests every supported book under a folder that is new or has changed
+        since the last sync, extracting files in parallel worker processes.
+        """
         if not os.path.exists(folder_path):
             return f"❌ Folder '{folder_path}' not found."
 
+        manifest = BookManifest(BOOK_MANIFEST_PATH)
+        pending = manifest.scan(folder_path, SUPPORTED_EXTENSIONS)
+
         results = []
-        for filename in os.listdir(folder_path):
-            if filename.lower().endswith(".pdf"):
-                full_path = os.path.join(folder_path, filename)
-                result = self.ingest_and_store_text(full_path)
-                results.append(result)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(ingest_file, path, True, EXTRACTION_CACHE_DIR, known_sha256): (path, stat)
+                for path, stat, known_sha256 in pending
+            }
+            for future in as_completed(futures):
+                path, stat = futures[future]
+                try:
+                    sha256, content = future.result()
+                except Exception as e:
+                    results.append(f"[Ingestion Error] {path}: {e}")
+                    continue
+
+                if content is not None:
+                    results.append(self._store_ingested(path, content))
+                manifest.record(path, stat, sha256)
+
+        manifest.save()
         return results
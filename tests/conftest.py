@@ -0,0 +1,30 @@
+# tests/conftest.py
+# 🧪 Lets the tests import sully_engine.* from the flat checkout (see flat_layout.py)
+
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flat_layout  # noqa: E402
+
+flat_layout.install()
+
+
+@pytest.fixture(scope="session")
+def api(tmp_path_factory):
+    # main builds Sully (and its on-disk stores) in the working directory,
+    # once per process, so every API test shares one app.
+    from fastapi.testclient import TestClient
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("api"))
+    try:
+        main = importlib.import_module("main")
+        with TestClient(main.app) as client:
+            yield main, client
+    finally:
+        os.chdir(cwd)
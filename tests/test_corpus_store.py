@@ -0,0 +1,92 @@
+# tests/test_corpus_store.py
+# 🧪 CorpusStore shared by several stores (and processes) on one directory
+
+import multiprocessing
+import os
+
+import pytest
+
+from sully_engine.kernel_modules.corpus_store import CorpusStore, fcntl
+
+
+def test_two_stores_on_one_directory(tmp_path):
+    root = str(tmp_path / "corpus")
+    a = CorpusStore(root, chunk_chars=8)
+    b = CorpusStore(root, chunk_chars=8)
+
+    doc_a = a.add("a.txt", "alpha written by the first store")
+    doc_b = b.add("b.txt", "beta written by the second store")
+    assert doc_a != doc_b
+    assert set(a.chunk_ids("a.txt")).isdisjoint(b.chunk_ids("b.txt"))
+
+    # b caught up with a's document before writing; a sees b's on refresh.
+    assert b.get("a.txt") == "alpha written by the first store"
+    assert "b.txt" not in a
+    assert a.refresh() == 1
+    assert a.get("b.txt") == "beta written by the second store"
+
+    # Re-ingesting through the other store supersedes the first version.
+    b.add("a.txt", "alpha, second edition")
+    a.refresh()
+    assert a.get("a.txt") == "alpha, second edition"
+    assert a.stats()["garbage_bytes"] == b.stats()["garbage_bytes"] > 0
+
+    a.close()
+    b.close()
+    reopened = CorpusStore(root, chunk_chars=8)
+    assert sorted(reopened.paths()) == ["a.txt", "b.txt"]
+    assert reopened.get("a.txt") == "alpha, second edition"
+    reopened.close()
+
+
+def test_uncommitted_writes_are_cut_back(tmp_path):
+    root = str(tmp_path / "corpus")
+    store = CorpusStore(root)
+    store.add("kept.txt", "committed text")
+    sizes = {name: os.path.getsize(os.path.join(root, name)) for name in os.listdir(root)}
+    store.close()
+
+    # A writer that died mid-add: chunk bytes and a record, no document line,
+    # then a torn document line.
+    with open(os.path.join(root, "segment-000000.dat"), "ab") as f:
+        f.write(b"orphaned chunk")
+    with open(os.path.join(root, "chunks.idx"), "ab") as f:
+        f.write(b"\0" * 24)
+    with open(os.path.join(root, "documents.jsonl"), "a", encoding="utf-8") as f:
+        f.write('{"path": "torn.txt", "doc_')
+
+    store = CorpusStore(root)
+    assert {name: os.path.getsize(os.path.join(root, name)) for name in sizes} == sizes
+    assert store.paths() == ["kept.txt"]
+    store.add("next.txt", "written after the repair")
+    assert store.get("kept.txt") == "committed text"
+    assert store.get("next.txt") == "written after the repair"
+    store.close()
+
+
+def add_documents(root, worker, count):
+    store = CorpusStore(root, chunk_chars=64)
+    for i in range(count):
+        store.add(f"w{worker}/{i}.txt", f"worker {worker} document {i} " * 10)
+    store.close()
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs the POSIX file lock")
+def test_processes_writing_at_once(tmp_path):
+    root = str(tmp_path / "corpus")
+    CorpusStore(root).close()
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=add_documents, args=(root, w, 25)) for w in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    assert all(process.exitcode == 0 for process in workers)
+
+    store = CorpusStore(root, chunk_chars=64)
+    assert len(store) == 100
+    assert sorted(store.documents[p]["doc_id"] for p in store.paths()) == list(range(100))
+    for worker in range(4):
+        for i in range(25):
+            assert store.get(f"w{worker}/{i}.txt") == f"worker {worker} document {i} " * 10
+    store.close()
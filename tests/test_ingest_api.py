@@ -0,0 +1,46 @@
+# tests/test_ingest_api.py
+# 🧪 Uploaded books: stable corpus keys and upload cleanup
+
+import os
+import time
+
+
+def wait_for(client, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/sully/ingest/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return client.get(f"/api/sully/ingest/{job_id}/result").json()
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def upload(client, name, data):
+    response = client.post("/api/sully/ingest", files={"file": (name, data, "text/plain")})
+    assert response.status_code == 202
+    return response.json()
+
+
+def test_reupload_replaces_the_book_and_cleans_up(api):
+    main, client = api
+    before = len(main.sully.corpus)
+
+    first = upload(client, "../shelf/Atlas.txt", b"first edition")
+    assert first["filename"] == "Atlas.txt"
+    assert wait_for(client, first["job_id"])["result"] == "[Book Ingested: Atlas.txt]"
+
+    second = wait_for(client, upload(client, "Atlas.txt", b"second edition")["job_id"])
+    assert second["status"] == "done"
+    assert len(main.sully.corpus) == before + 1
+    assert main.sully.corpus.get("Atlas.txt") == "second edition"
+
+    for job in (first, second):
+        assert not os.path.exists(os.path.join(main.UPLOAD_DIR, job["job_id"]))
+
+
+def test_failed_job_cleans_up(api):
+    main, client = api
+    job = wait_for(client, upload(client, "empty.txt", b"   ")["job_id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "No content extracted"
+    assert not os.path.exists(os.path.join(main.UPLOAD_DIR, job["job_id"]))
@@ -0,0 +1,36 @@
+# tests/test_ingest_books.py
+# 🧪 Extraction failures raise; bracketed text is just text
+
+import pytest
+
+from sully_engine.kernel_modules.extraction_cache import ExtractionCache
+from sully_engine.kernel_modules.ingest_books import BookIngestor, IngestionError, ingest_file
+
+
+@pytest.mark.parametrize("text", ["[Data Error] in the 1998 census", "[Missing `chapter`]", "[OCR ERROR] notes"])
+def test_bracketed_content_is_ingested(tmp_path, text):
+    path = tmp_path / "book.txt"
+    path.write_text(text, encoding="utf-8")
+
+    assert BookIngestor().ingest(str(path)) == text
+    assert ingest_file(str(path))[1] == text
+
+
+def test_failures_raise_and_are_not_cached(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    ingestor = BookIngestor(cache=cache)
+
+    unsupported = tmp_path / "book.epub"
+    unsupported.write_bytes(b"not a book")
+    with pytest.raises(IngestionError, match="Unsupported file type"):
+        ingestor.ingest(str(unsupported))
+
+    binary = tmp_path / "book.txt"
+    binary.write_bytes(b"\xff\xfe\xfa")
+    with pytest.raises(IngestionError, match="Text file error"):
+        ingestor.ingest(str(binary))
+    binary.write_text("fixed", encoding="utf-8")
+    assert ingestor.ingest(str(binary)) == "fixed"
+
+    with pytest.raises(IngestionError, match="Cannot read file"):
+        ingest_file(str(tmp_path / "missing.txt"))
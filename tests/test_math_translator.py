@@ -0,0 +1,40 @@
+# tests/test_math_translator.py
+# 🧪 Mapping edits go through the translator, so cached translations never go stale
+
+import pytest
+
+from sully_engine.kernel_modules.math_translator import SymbolicMathTranslator
+
+
+def test_mappings_are_read_only():
+    translator = SymbolicMathTranslator()
+    with pytest.raises(TypeError):
+        translator.math_mappings["entropy"] = "S = k ln W"
+    with pytest.raises(AttributeError):
+        translator.math_mappings.update({"entropy": "S = k ln W"})
+    with pytest.raises(TypeError):
+        dict.update(translator.math_mappings, {"entropy": "S = k ln W"})
+    assert translator.translate("entropy")["matches"] == {}
+
+
+def test_every_edit_bumps_the_revision():
+    translator = SymbolicMathTranslator()
+    seen = {translator.revision()}
+
+    translator.add_mapping("Entropy", "S = k ln W")
+    seen.add(translator.revision())
+    assert translator.update_mappings({"Wave": "ψ", "infinity": "∞"}) == 2
+    seen.add(translator.revision())
+    translator.restore({"void": "∅"})
+    seen.add(translator.revision())
+
+    assert len(seen) == 4
+    assert translator.translate("the void")["matches"] == {"void": "∅"}
+    assert translator.export_mappings() == {"void": "∅"}
+
+
+def test_update_mappings_translates_new_phrases():
+    translator = SymbolicMathTranslator()
+    translator.update_mappings({"Wave Function": "ψ(x)", "growth": "e^x"})
+    result = translator.translate("growth of the wave function")
+    assert result["matches"] == {"growth": "e^x", "wave function": "ψ(x)"}
@@ -0,0 +1,150 @@
+# tests/test_passage_index.py
+# 🧪 PassageIndex staying current as documents are re-ingested, and persisting its segments
+
+import os
+import threading
+
+from sully_engine.kernel_modules.corpus_store import CorpusStore
+from sully_engine.passage_index import PassageIndex
+
+
+def test_sync_does_not_reindex_a_superseded_version(tmp_path):
+    corpus = CorpusStore(str(tmp_path / "corpus"))
+    corpus.add("book.txt", "the old edition speaks of comets")
+    index = PassageIndex(corpus)
+
+    # Let the sync thread look up the old version, then ingest a new one
+    # (as an upload would) before the sync thread gets the lock.
+    looked_up = threading.Event()
+    chunk_ids = corpus.chunk_ids
+
+    def tracking_chunk_ids(path):
+        ids = chunk_ids(path)
+        if threading.current_thread() is not threading.main_thread():
+            looked_up.set()
+        return ids
+
+    corpus.chunk_ids = tracking_chunk_ids
+    with index._lock:
+        syncing = threading.Thread(target=index.sync)
+        syncing.start()
+        looked_up.wait(timeout=0.5)
+        corpus.add("book.txt", "the new edition speaks of nebulae")
+        index.add_document("book.txt")
+    syncing.join()
+
+    assert index.indexed["book.txt"] == chunk_ids("book.txt")
+    assert len(index) == 1
+    assert [p["excerpt"] for p in index.search("nebulae")] == ["the new edition speaks of nebulae"]
+    assert index.search("comets") == []
+    corpus.close()
+
+
+def test_add_document_retires_previous_version(tmp_path):
+    corpus = CorpusStore(str(tmp_path / "corpus"))
+    index = PassageIndex(corpus)
+    corpus.add("a.txt", "alpha beta")
+    index.add_document("a.txt")
+    corpus.add("a.txt", "gamma delta")
+    index.add_document("a.txt")
+
+    assert len(index) == 1
+    assert index.search("alpha") == []
+    assert index.search("gamma")[0]["path"] == "a.txt"
+    corpus.close()
+
+
+def build(root, books, flush_chunks):
+    corpus = CorpusStore(str(root), chunk_chars=64)
+    index = PassageIndex(corpus, flush_chunks=flush_chunks)
+    for path, text in books:
+        corpus.add(path, text)
+        index.add_document(path)
+    return corpus, index
+
+
+BOOKS = [
+    (f"book-{i % 7}.txt", " ".join(f"word{(i * j) % 31} comet{j % 5} nebula{i}" for j in range(40)))
+    for i in range(30)
+]
+QUERIES = ["comet3", "word7 nebula12", "nebula29 comet1", "word30", "missing"]
+
+
+def test_persisted_segments_match_an_in_memory_index(tmp_path):
+    memory_corpus, in_memory = build(tmp_path / "memory", BOOKS, flush_chunks=10 ** 9)
+    corpus, index = build(tmp_path / "persisted", BOOKS, flush_chunks=8)
+
+    assert not in_memory.segments
+    assert 1 < len(index.segments) < 8  # flushed, and merged as they piled up
+    names = sorted(os.listdir(index.root))
+    assert names == sorted(os.path.basename(s.path) for s in index.segments)
+    for query in QUERIES:
+        assert index.search(query, k=10) == in_memory.search(query, k=10)
+
+    # A new process maps the segments and only tokenizes what follows them.
+    reopened = CorpusStore(corpus.root, chunk_chars=64)
+    warm = PassageIndex(reopened, flush_chunks=8)
+    tokenized = []
+    chunk_text = reopened.chunk_text
+
+    def tracking_chunk_text(chunk_id):
+        tokenized.append(chunk_id)
+        return chunk_text(chunk_id)
+
+    reopened.chunk_text = tracking_chunk_text
+    warm.sync()
+    assert len(warm) == len(in_memory)
+    assert warm.base_end > 0 and all(chunk_id >= warm.base_end for chunk_id in tokenized)
+    reopened.chunk_text = chunk_text
+    for query in QUERIES:
+        assert warm.search(query, k=10) == in_memory.search(query, k=10)
+    for store in (memory_corpus, corpus, reopened):
+        store.close()
+
+
+def test_retiring_a_persisted_version_does_not_reread_it(tmp_path):
+    corpus, index = build(tmp_path / "corpus", BOOKS, flush_chunks=4)
+    old = index.indexed["book-0.txt"]
+    assert old.stop <= index.base_end
+
+    chunk_text = corpus.chunk_text
+
+    def new_chunks_only(chunk_id):
+        assert chunk_id not in old, "retired chunk was re-read"
+        return chunk_text(chunk_id)
+
+    corpus.chunk_text = new_chunks_only
+    corpus.add("book-0.txt", "a revised edition about quasars")
+    index.add_document("book-0.txt")
+    corpus.chunk_text = chunk_text
+
+    fresh_corpus, fresh = build(
+        tmp_path / "fresh", BOOKS + [("book-0.txt", "a revised edition about quasars")], flush_chunks=10 ** 9
+    )
+    assert len(index) == len(fresh)
+    for query in QUERIES + ["quasars"]:
+        assert index.search(query, k=10) == fresh.search(query, k=10)
+    corpus.close()
+    fresh_corpus.close()
+
+
+def test_two_indexes_share_one_corpus_directory(tmp_path):
+    # Two workers on one corpus: each ingests, flushes and merges
+    # segments, and picks up the other's on sync.
+    root = str(tmp_path / "corpus")
+    workers = [CorpusStore(root, chunk_chars=64) for _ in range(2)]
+    indexes = [PassageIndex(corpus, flush_chunks=4) for corpus in workers]
+    for i, (path, text) in enumerate(BOOKS):
+        corpus, index = workers[i % 2], indexes[i % 2]
+        corpus.add(path, text)
+        index.add_document(path)
+    for index in indexes:
+        index.sync()
+
+    fresh_corpus, fresh = build(tmp_path / "fresh", BOOKS, flush_chunks=10 ** 9)
+    for index in indexes:
+        assert index.segments and len(index) == len(fresh)
+        for query in QUERIES:
+            assert index.search(query, k=10) == fresh.search(query, k=10)
+    for corpus in workers + [fresh_corpus]:
+        corpus.close()
@@ -0,0 +1,47 @@
+# tests/test_response_cache.py
+# 🧪 Cached translate/paradox responses: revalidation and invalidation on change
+
+import pytest
+
+from sully_engine.kernel_modules.response_cache import ResponseCache
+
+
+def test_cache_expires_and_evicts(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    cache = ResponseCache(max_entries=2, ttl=10)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts b, the least recently used
+    assert cache.get("b") is None
+    now[0] += 11
+    assert cache.get("a") is None
+
+
+def test_translate_revalidates_and_follows_new_mappings(api):
+    main, client = api
+    first = client.get("/api/sully/translate", params={"phrase": "quantum drift"})
+    assert first.json()["translation"]["matches"] == {}
+    tag = first.headers["etag"]
+
+    again = client.get("/api/sully/translate", params={"phrase": "quantum drift"},
+                       headers={"If-None-Match": tag})
+    assert again.status_code == 304
+
+    main.sully.translator.add_mapping("quantum drift", "ψ(t)")
+    changed = client.get("/api/sully/translate", params={"phrase": "quantum drift"},
+                         headers={"If-None-Match": tag})
+    assert changed.status_code == 200
+    assert changed.json()["translation"]["matches"] == {"quantum drift": "ψ(t)"}
+    assert changed.headers["etag"] != tag
+
+
+def test_paradox_follows_additions(api):
+    main, client = api
+    before = client.get("/api/sully/paradox", params={"topic": "Mirror Loop"}).json()
+    assert "message" in before["paradox"]
+
+    main.sully.paradox.add("Mirror Loop", "circular", "The mirror reflects the mirror.", "Reflection of reflection.")
+    after = client.get("/api/sully/paradox", params={"topic": "Mirror Loop"}).json()
+    assert after["paradox"]["description"] == "The mirror reflects the mirror."
@@ -0,0 +1,95 @@
+# tests/test_snapshot.py
+# 🧪 Snapshot round trip: a restored Sully searches like the one that saved it
+
+import random
+
+import pytest
+
+from sully import Sully
+from sully_engine.snapshot import Snapshot
+
+WORDS = ["infinity", "change", "paradox", "entropy", "symbol", "dream",
+         "recursion", "origin", "memory", "growth", "truth", "mirror"]
+NEEDLES = ["e", "#1", "en", "entropy", "entropy mirror", "Mirror", "topic 1", "zzz", ""]
+
+
+@pytest.fixture
+def saved(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = random.Random(7)
+    sully = Sully()
+    sully.memory.store_queries(
+        (" ".join(rng.choice(WORDS) for _ in range(3)) + f" #{i}", f"result {i}") for i in range(500)
+    )
+    for i in range(300):
+        sully.codex.record(f"Topic {i} {rng.choice(WORDS)}", {"reframed": " ".join(rng.sample(WORDS, 3))})
+    sully.codex.record("Topic 5 again", {"reframed": "first"})
+    sully.codex.record("topic 5 again", {"reframed": "second"})
+    sully.paradox.add("Mirror Loop", "circular", "The mirror reflects the mirror.", "Reflection of reflection.")
+    sully.save_snapshot("state.snapshot")
+    return sully
+
+
+def search_both(live, restored, needle, **kwargs):
+    return live.search(needle, **kwargs), restored.search(needle, **kwargs)
+
+
+def without_timestamps(results):
+    return {key: {k: v for k, v in entry.items() if k != "timestamp"} for key, entry in results.items()}
+
+
+def test_restored_search_matches_live(saved):
+    restored = Sully()
+    restored.load_snapshot("state.snapshot")
+
+    for needle in NEEDLES:
+        for case_sensitive in (False, True):
+            for limit in (None, 5):
+                kwargs = {"case_sensitive": case_sensitive, "limit": limit}
+                live, back = search_both(saved.memory, restored.memory, needle, **kwargs)
+                assert live == back, (needle, kwargs)
+                live, back = search_both(saved.codex, restored.codex, needle, **kwargs)
+                assert live == back, (needle, kwargs)
+                assert list(live) == list(back)
+
+    assert restored.codex.export() == saved.codex.export()
+    assert restored.codex.page(cursor=290, limit=20) == saved.codex.page(cursor=290, limit=20)
+    assert restored.paradox.export() == saved.paradox.export()
+
+
+def test_restored_stores_take_new_writes(saved):
+    restored = Sully()
+    restored.load_snapshot("state.snapshot")
+
+    for sully in (saved, restored):
+        sully.memory.store_query("a fresh entropy mirror", "new")
+        sully.codex.record("topic 3 renamed", {"reframed": "brand new words"})
+        sully.codex.record("Topic 0 " + saved.codex.list_topics()[0].split()[-1], {"reframed": "replaced"})
+
+    for needle in ["fresh", "brand new", "replaced", "entropy mirror", "e"]:
+        for live, back in [search_both(saved.memory, restored.memory, needle),
+                           search_both(saved.codex, restored.codex, needle)]:
+            assert without_timestamps(live) == without_timestamps(back), needle
+            assert list(live) == list(back)
+    # The replaced entry's old text only lives in the mapped postings; it must
+    # no longer match.
+    old = saved.codex.search("replaced")
+    assert all(entry["reframed"] == "replaced" for entry in old.values())
+    assert len(restored.codex.entries) == len(saved.codex.entries)
+
+
+def test_save_while_recording(saved):
+    # export() hands out copies, so a save can encode them while writers run.
+    entries = saved.codex.export()
+    paradoxes = saved.paradox.export()
+    saved.codex.record("another topic", {"reframed": "x"})
+    saved.paradox.add("Another", "loop", "a", "b")
+    assert "another topic" not in entries
+    assert "Another" not in paradoxes
+
+
+def test_empty_snapshot_is_rejected(tmp_path):
+    path = tmp_path / "empty.snapshot"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        Snapshot(str(path))